@@ -5,6 +5,7 @@ Run this if you can't login after deployment
 """
 
 from db_config import get_db_connection, release_db_connection, get_placeholder
+from password_hashing import hash_password
 
 def add_users():
     """Add default users to the database"""
@@ -31,7 +32,7 @@ def add_users():
             try:
                 # Try to insert user
                 c.execute(f"INSERT INTO users (username, password, role) VALUES ({ph}, {ph}, {ph})",
-                         (username, password, role))
+                         (username, hash_password(password), role))
                 conn.commit()
                 print(f"✅ Added user: {username} ({role})")
                 added += 1
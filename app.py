@@ -4,11 +4,12 @@ import sqlite3
 import io
 import re
 import json
+import hashlib
 import logging
 from datetime import datetime
 
 # Flask Imports
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, make_response, Response
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, make_response, Response, stream_with_context
 
 
 #ReportLab Imports
@@ -25,6 +26,18 @@ import base64
 # WeasyPrint for HTML to PDF conversion
 from weasyprint import HTML, CSS
 
+# orjson for fast JSON responses on polled endpoints (optional, falls back to jsonify)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# fcntl (POSIX only) for the SQLite migration lock; the Windows build runs migrations unlocked
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 # Database Config Import
 from db_config import get_db_connection, get_db_type, get_placeholder, release_db_connection
 
@@ -37,6 +50,8 @@ from alert_system import (create_alert, read_alerts, acknowledge_alert, get_aler
                           alert_code_tampered, alert_unauthorized_login, alert_license_invalid,
                           SEVERITY_CRITICAL, SEVERITY_WARNING, SEVERITY_INFO)
 from security_monitoring import security_monitor
+from password_hashing import hash_password, is_password_hash, verify_password
+from detail_cache import clear_details, invalidate_details
 
 # Import from correct database module based on DATABASE_URL
 if get_db_type() == 'postgresql':
@@ -111,6 +126,18 @@ app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
+logger = logging.getLogger(__name__)
+
+def fast_jsonify(payload):
+    """
+    Serialize payload with orjson when available, otherwise Flask's jsonify.
+
+    Used by endpoints the admin dashboard polls frequently, where stdlib json
+    encoding of a few hundred dicts is the dominant per-request cost.
+    """
+    if orjson is None:
+        return jsonify(payload)
+    return app.response_class(orjson.dumps(payload, default=str), mimetype='application/json')
 
 def get_dict_cursor(conn):
     """Get a cursor that returns dictionary-like rows for both SQLite and PostgreSQL"""
@@ -120,6 +147,11 @@ def get_dict_cursor(conn):
         conn.row_factory = sqlite3.Row
         return conn.cursor()
 
+# Startup schema work (init_db, form tables, checklist/form-field migrations).
+# Set RUN_MIGRATIONS=0 on web processes when migrations are run by a separate
+# deploy step, so workers boot without touching the database schema.
+RUN_MIGRATIONS = os.environ.get('RUN_MIGRATIONS', '1') == '1'
+
 # Auto-initialize database if it doesn't exist (for Gunicorn/Render deployment)
 # Run in background thread to not block Gunicorn startup
 def init_database_async():
@@ -192,7 +224,8 @@ def init_database_async():
     thread.start()
 
 # Start background initialization
-init_database_async()
+if RUN_MIGRATIONS:
+    init_database_async()
 
 # Run SQLite migrations for existing databases
 # Moved to background thread to not block startup
@@ -250,7 +283,8 @@ def run_sqlite_migrations_async():
     thread = threading.Thread(target=run_sqlite_migrations, daemon=True)
     thread.start()
 
-run_sqlite_migrations_async()
+if RUN_MIGRATIONS:
+    run_sqlite_migrations_async()
 
 # =============================================================================
 # SECURITY INITIALIZATION - Zo-Zi Protection System
@@ -2129,6 +2163,7 @@ def fix_institutional_status():
             f"Updated inspection {inspection_id}: Overall={overall_score}, Critical={critical_score}, Result={result}")
 
     conn.commit()
+    clear_details()
     release_db_connection(conn)
 
     return f"Updated {updated_count} institutional inspection records! <a href='/dashboard'>Back to Dashboard</a>"
@@ -2263,6 +2298,7 @@ def submit_spirit_licence():
             c.execute("INSERT INTO inspection_items (inspection_id, item_id, details) VALUES (%s, %s, %s)",
                       (inspection_id, item['id'], score))
         conn.commit()
+        invalidate_details('inspection', inspection_id)
         release_db_connection(conn)
 
         # Check and create alert if score below threshold
@@ -2323,6 +2359,7 @@ def submit_form(form_type):
                 query = f"INSERT INTO inspection_items (inspection_id, item_id, details) VALUES ({ph}, {ph}, {ph})"
                 c.execute(query, (inspection_id, item["id"], score))
             conn.commit()
+            invalidate_details('inspection', inspection_id)
             release_db_connection(conn)
 
             # Check and create alert if score below threshold
@@ -2398,6 +2435,7 @@ def submit_residential():
             c.execute(f"INSERT INTO residential_checklist_scores (form_id, item_id, score) VALUES ({ph}, {ph}, {ph})",
                       (inspection_id, item["id"], safe_score))
         conn.commit()
+        invalidate_details('residential', inspection_id)
         release_db_connection(conn)
 
         # Check and create alert if score below threshold
@@ -2545,6 +2583,7 @@ def submit_meat_processing():
             c.execute(f"INSERT INTO meat_processing_checklist_scores (form_id, item_id, score) VALUES ({ph}, {ph}, {ph})",
                       (inspection_id, item["id"], safe_score))
         conn.commit()
+        invalidate_details('meat', inspection_id)
         release_db_connection(conn)
 
         return jsonify({'status': 'success', 'message': 'Submit successfully', 'inspection_id': inspection_id})
@@ -2562,28 +2601,24 @@ def submit_swimming_pools():
     cursor = conn.cursor()
 
     # Auto-fix database columns if needed - check if columns exist first
-    # Check existing columns
-    if get_db_type() == 'postgresql':
-        cursor.execute("""
-            SELECT column_name FROM information_schema.columns
-            WHERE table_name = 'inspections' AND table_schema = 'public'
-        """)
-        existing_columns = {row[0] for row in cursor.fetchall()}
-    else:
-        cursor.execute("PRAGMA table_info(inspections)")
-        existing_columns = {row[1] for row in cursor.fetchall()}
-
-    # Add columns only if they don't exist
-    for item in SWIMMING_POOL_CHECKLIST_ITEMS:
-        col_name = f"score_{item['id']}"
-        if col_name not in existing_columns:
-            try:
-                cursor.execute(f'ALTER TABLE inspections ADD COLUMN {col_name} REAL DEFAULT 0')
-                print(f"Added column {col_name}")
-                conn.commit()  # Commit each column addition
-            except Exception as e:
-                conn.rollback()  # Rollback on error
-                print(f"Error adding {col_name}: {e}")
+    existing_columns = set(get_table_columns(cursor, 'inspections'))
+
+    # Add only the missing columns, all in one batch and one transaction
+    missing_columns = [f"score_{item['id']}" for item in SWIMMING_POOL_CHECKLIST_ITEMS
+                       if f"score_{item['id']}" not in existing_columns]
+    if missing_columns:
+        statements = [f'ALTER TABLE inspections ADD COLUMN {col_name} REAL DEFAULT 0'
+                      for col_name in missing_columns]
+        try:
+            if get_db_type() == 'postgresql':
+                cursor.execute(';\n'.join(statements))
+                conn.commit()
+            else:
+                conn.executescript('BEGIN;\n' + ';\n'.join(statements) + ';\nCOMMIT;')
+            print(f"Added columns {', '.join(missing_columns)}")
+        except Exception as e:
+            conn.rollback()  # Rollback on error
+            print(f"Error adding swimming pool score columns: {e}")
 
     # Extract form data
     operator = request.form.get('operator')
@@ -2717,6 +2752,7 @@ def submit_swimming_pools():
         ''', (inspection_id, item['id'], str(score)))
 
     conn.commit()
+    invalidate_details('inspection', inspection_id)
     release_db_connection(conn)
 
     print(f"=== FINAL SUCCESS: Inspection {inspection_id} completely saved ===")
@@ -2941,6 +2977,7 @@ def submit_small_hotels():
         ))
 
     conn.commit()
+    invalidate_details('inspection', inspection_id)
     release_db_connection(conn)
 
     return jsonify({
@@ -3184,6 +3221,7 @@ def fix_inspection_results():
             f"Updated inspection {inspection_id}: {form_type} - Overall: {overall_score}, Critical: {critical_score} → {new_result}")
 
     conn.commit()
+    clear_details()
     release_db_connection(conn)
 
     return f"Updated {updated_count} inspection results! <a href='/dashboard'>Back to Dashboard</a>"
@@ -4814,6 +4852,7 @@ def submit_barbershop():
             ''', (inspection_id, item['id'], str(score)))
 
         conn.commit()
+        invalidate_details('inspection', inspection_id)
         release_db_connection(conn)
 
         # Check and create alert if score below threshold
@@ -5319,6 +5358,7 @@ def fix_all_forms_to_pass_fail():
     total_updated = residential_updated + main_updated
 
     conn.commit()
+    clear_details()
     release_db_connection(conn)
 
     return f"""
@@ -5729,7 +5769,7 @@ def init_db():
                 VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, 0)
                 ON CONFLICT (username) DO UPDATE
                 SET password = EXCLUDED.password, role = EXCLUDED.role, email = EXCLUDED.email, parish = EXCLUDED.parish, first_login = 0
-            """, ('admin', 'Admin901!secure', 'admin', 'admin@inspection.local', 'Westmoreland'))
+            """, ('admin', hash_password('Admin901!secure'), 'admin', 'admin@inspection.local', 'Westmoreland'))
 
             # Insert 3 specific inspector users with secure passwords
             c.execute(f"""
@@ -5737,21 +5777,21 @@ def init_db():
                 VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
                 ON CONFLICT (username) DO UPDATE
                 SET password = EXCLUDED.password, role = EXCLUDED.role, email = EXCLUDED.email, parish = EXCLUDED.password
-            """, ('inspector1', 'Insp123!secure', 'inspector', 'inspector1@inspection.local', 'Westmoreland'))
+            """, ('inspector1', hash_password('Insp123!secure'), 'inspector', 'inspector1@inspection.local', 'Westmoreland'))
 
             c.execute(f"""
                 INSERT INTO users (username, password, role, email, parish)
                 VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
                 ON CONFLICT (username) DO UPDATE
                 SET password = EXCLUDED.password, role = EXCLUDED.role, email = EXCLUDED.email, parish = EXCLUDED.parish
-            """, ('inspector2', 'Insp456!secure', 'inspector', 'inspector2@inspection.local', 'Westmoreland'))
+            """, ('inspector2', hash_password('Insp456!secure'), 'inspector', 'inspector2@inspection.local', 'Westmoreland'))
 
             c.execute(f"""
                 INSERT INTO users (username, password, role, email, parish)
                 VALUES ({ph}, {ph}, {ph}, {ph}, {ph})
                 ON CONFLICT (username) DO UPDATE
                 SET password = EXCLUDED.password, role = EXCLUDED.role, email = EXCLUDED.email, parish = EXCLUDED.parish
-            """, ('inspector3', 'Insp789!secure', 'inspector', 'inspector3@inspection.local', 'Westmoreland'))
+            """, ('inspector3', hash_password('Insp789!secure'), 'inspector', 'inspector3@inspection.local', 'Westmoreland'))
 
             conn.commit()
             logging.info("✅ Created Inspection app users: admin, inspector1, inspector2, inspector3")
@@ -5761,13 +5801,13 @@ def init_db():
 
             # Insert users with correct credentials (INSERT OR IGNORE skips if exists)
             c.execute('INSERT OR IGNORE INTO users (username, password, role, email, parish) VALUES (?, ?, ?, ?, ?)',
-                      ('admin', 'Admin901!secure', 'admin', 'admin@inspection.local', 'Westmoreland'))
+                      ('admin', hash_password('Admin901!secure'), 'admin', 'admin@inspection.local', 'Westmoreland'))
             c.execute('INSERT OR IGNORE INTO users (username, password, role, email, parish) VALUES (?, ?, ?, ?, ?)',
-                      ('inspector1', 'Insp123!secure', 'inspector', 'inspector1@inspection.local', 'Westmoreland'))
+                      ('inspector1', hash_password('Insp123!secure'), 'inspector', 'inspector1@inspection.local', 'Westmoreland'))
             c.execute('INSERT OR IGNORE INTO users (username, password, role, email, parish) VALUES (?, ?, ?, ?, ?)',
-                      ('inspector2', 'Insp456!secure', 'inspector', 'inspector2@inspection.local', 'Westmoreland'))
+                      ('inspector2', hash_password('Insp456!secure'), 'inspector', 'inspector2@inspection.local', 'Westmoreland'))
             c.execute('INSERT OR IGNORE INTO users (username, password, role, email, parish) VALUES (?, ?, ?, ?, ?)',
-                      ('inspector3', 'Insp789!secure', 'inspector', 'inspector3@inspection.local', 'Westmoreland'))
+                      ('inspector3', hash_password('Insp789!secure'), 'inspector', 'inspector3@inspection.local', 'Westmoreland'))
             conn.commit()
             logging.info("✅ Created Inspection app users: admin, inspector1, inspector2, inspector3")
     except Exception as e:
@@ -5839,9 +5879,10 @@ def login_post():
         error_occurred = False
         try:
             # Support login with either username OR email (for shared database with Zo-Zi Marketplace)
-            c = execute_query(conn, "SELECT id, username, password, role, email, parish, first_login FROM users WHERE (username = %s OR email = %s) AND password = %s",
-                      (username, username, password))
-            user = c.fetchone()
+            c = execute_query(conn, "SELECT id, username, password, role, email, parish, first_login FROM users WHERE (username = %s OR email = %s)",
+                      (username, username))
+            # Stored passwords are salted hashes (or plain text for older accounts)
+            user = next((row for row in c.fetchall() if verify_password(row['password'], password)), None)
             # If we get here, the query succeeded - break out of retry loop
             break
         except Exception as e:
@@ -5898,6 +5939,12 @@ def login_post():
                 'error': 'Invalid credentials'
             })
 
+        # Replace a legacy plain-text password with its hash once it has matched
+        if not is_password_hash(user['password']):
+            execute_query(conn, "UPDATE users SET password = %s WHERE id = %s",
+                          (hash_password(password), user['id']))
+            conn.commit()
+
         if (login_type == 'inspector' and user['role'] == 'inspector') or \
            (login_type == 'admin' and user['role'] == 'admin') or \
            (login_type == 'medical_officer' and user['role'] == 'medical_officer'):
@@ -6065,7 +6112,7 @@ def change_first_login_password():
 
             # Update password and set first_login to 0
             execute_query(conn, "UPDATE users SET password = %s, first_login = 0 WHERE username = %s",
-                        (new_password, username))
+                        (hash_password(new_password), username))
             conn.commit()
 
             # Use username if available, otherwise use email
@@ -7746,7 +7793,7 @@ def add_user():
             c.execute('''
                 INSERT INTO users (username, email, password, role, is_flagged, first_login)
                 VALUES (%s, %s, %s, %s, 0, 1)
-            ''', (username, email, password, role))
+            ''', (username, email, hash_password(password), role))
 
             conn.commit()
 
@@ -8045,6 +8092,10 @@ def init_form_management_db():
         FOREIGN KEY (form_template_id) REFERENCES form_templates(id)
     )''')
 
+    # Ordered item lookups per template (PostgreSQL gets a covering index in database.init_db)
+    if get_db_type() != 'postgresql':
+        c.execute('CREATE INDEX IF NOT EXISTS idx_form_items_tpl_order ON form_items(form_template_id, item_order)')
+
     # Form Categories Table - For organizing items
     c.execute(f'''CREATE TABLE IF NOT EXISTS form_categories (
         id {auto_inc},
@@ -12552,6 +12603,49 @@ def delete_form_field(field_id):
 # ACTIVE USERS API - Show logged-in users on admin map
 # ============================================================================
 
+# Active sessions with VALID GPS coordinates (logged in within last 24 hours)
+# Only show users who have real location data - no nulls, no fake coordinates
+# One marker per user: re-logins leave several active sessions, keep the most recent.
+# The database type is fixed for the process, so the query is chosen once at import.
+if get_db_type() == 'postgresql':
+    ACTIVE_USERS_MAP_SQL = '''
+        WITH latest AS (
+            SELECT DISTINCT ON (username)
+                   username, user_role, location_lat, location_lng, parish, login_time, last_activity
+            FROM user_sessions
+            WHERE is_active = 1
+            AND last_activity::timestamp > (NOW() - INTERVAL '24 hours')
+            AND location_lat IS NOT NULL
+            AND location_lng IS NOT NULL
+            AND location_lat != 0
+            AND location_lng != 0
+            ORDER BY username, last_activity DESC
+        )
+        SELECT * FROM latest
+        ORDER BY last_activity DESC
+    '''
+else:
+    # SQLite takes the bare columns from the row that supplies MAX(last_activity).
+    # last_activity is stored as 'YYYY-MM-DD HH:MM:SS' text, which sorts
+    # chronologically, so it is compared to a bound cutoff with no datetime() wrap.
+    ACTIVE_USERS_MAP_SQL = '''
+        SELECT username, user_role, location_lat, location_lng, parish, login_time,
+               MAX(last_activity) AS last_activity
+        FROM user_sessions
+        WHERE is_active = 1
+        AND last_activity > ?
+        AND location_lat IS NOT NULL
+        AND location_lng IS NOT NULL
+        AND location_lat != 0
+        AND location_lng != 0
+        GROUP BY username
+        ORDER BY last_activity DESC
+    '''
+
+# Rows pulled per fetchmany() while streaming the active-users map
+ACTIVE_USERS_MAP_BATCH = 512
+
+
 @app.route('/api/admin/active_users_map', methods=['GET'])
 def get_active_users_map():
     """Get all currently logged-in users with their locations for the map"""
@@ -12559,50 +12653,61 @@ def get_active_users_map():
         return jsonify({'error': 'Unauthorized'}), 401
 
     conn = get_db_connection()
-    c = conn.cursor()
 
-    # Get all active sessions with VALID GPS coordinates (logged in within last 24 hours)
-    # Only show users who have real location data - no nulls, no fake coordinates
-    if get_db_type() == 'postgresql':
-        c.execute('''
-            SELECT username, user_role, location_lat, location_lng, parish, login_time, last_activity
-            FROM user_sessions
-            WHERE is_active = 1
-            AND last_activity::timestamp > (NOW() - INTERVAL '24 hours')
-            AND location_lat IS NOT NULL
-            AND location_lng IS NOT NULL
-            AND location_lat != 0
-            AND location_lng != 0
-            ORDER BY last_activity DESC
-        ''')
-    else:
-        c.execute('''
-            SELECT username, user_role, location_lat, location_lng, parish, login_time, last_activity
-            FROM user_sessions
-            WHERE is_active = 1
-            AND datetime(last_activity) > datetime('now', '-24 hours')
-            AND location_lat IS NOT NULL
-            AND location_lng IS NOT NULL
-            AND location_lat != 0
-            AND location_lng != 0
-            ORDER BY last_activity DESC
-        ''')
+    try:
+        if get_db_type() == 'postgresql':
+            # Named cursor = server-side portal, so rows arrive in fetchmany batches
+            c = conn.cursor(name='active_users_map')
+            c.execute(ACTIVE_USERS_MAP_SQL)
+        else:
+            c = conn.cursor()
+            # Same local-time format the login route writes into last_activity
+            cutoff = (datetime.now() - timedelta(hours=24)).strftime('%Y-%m-%d %H:%M:%S')
+            c.execute(ACTIVE_USERS_MAP_SQL, (cutoff,))
+    except Exception:
+        release_db_connection(conn, error=True)
+        raise
 
-    users = []
-    for row in c.fetchall():
-        users.append({
-            'username': row[0],
-            'role': row[1],
-            'lat': row[2],
-            'lng': row[3],
-            'parish': row[4],
-            'login_time': row[5],
-            'last_activity': row[6]
-        })
+    def dumps(user):
+        if orjson is not None:
+            return orjson.dumps(user, default=str).decode('utf-8')
+        return json.dumps(user, default=str)
+
+    def generate():
+        count = 0
+        yield '{"users":['
+        while True:
+            rows = c.fetchmany(ACTIVE_USERS_MAP_BATCH)
+            if not rows:
+                break
+            chunk = ','.join(dumps({
+                'username': row[0],
+                'role': row[1],
+                'lat': row[2],
+                'lng': row[3],
+                'parish': row[4],
+                'login_time': row[5],
+                # Keep the 'YYYY-MM-DD HH:MM:SS' text shape for TIMESTAMP columns
+                'last_activity': str(row[6]) if row[6] is not None else None
+            }) for row in rows)
+            yield (',' if count else '') + chunk
+            count += len(rows)
+        yield f'],"count":{count}}}'
+        logger.debug(f"📍 Active Users Map API: Returning {count} users with valid GPS coordinates")
+
+    def close():
+        try:
+            c.close()
+        except Exception:
+            pass
+        release_db_connection(conn)
 
-    release_db_connection(conn)
-    print(f"📍 Active Users Map API: Returning {len(users)} users with valid GPS coordinates")
-    return jsonify({'users': users, 'count': len(users)})
+    response = Response(stream_with_context(generate()), mimetype='application/json')
+    # Runs when the server closes the response, even if the body was never
+    # iterated (client gone before the first chunk), so the connection is
+    # always returned to the pool
+    response.call_on_close(close)
+    return response
 
 
 def auto_migrate_checklists():
@@ -12632,61 +12737,98 @@ def auto_migrate_checklists():
         print(f"⚠️  Auto-migration error: {str(e)}")
 
 
+# Map form types to their hardcoded checklists
+FORM_CHECKLISTS = {
+    'Food Establishment': FOOD_CHECKLIST_ITEMS,
+    'Residential': RESIDENTIAL_CHECKLIST_ITEMS,
+    'Spirit Licence Premises': SPIRIT_LICENCE_CHECKLIST_ITEMS,
+    'Swimming Pool': SWIMMING_POOL_CHECKLIST_ITEMS,
+    'Small Hotel': SMALL_HOTELS_CHECKLIST_ITEMS,
+    'Barbershop': BARBERSHOP_CHECKLIST_ITEMS,
+    'Institutional': INSTITUTIONAL_CHECKLIST_ITEMS,
+    'Meat Processing': MEAT_PROCESSING_CHECKLIST_ITEMS,
+}
+
+# form_items seed rows per form type: (item_order, category, description, weight, is_critical)
+# Built once at import; the checklist constants never change at runtime.
+SEED_ROWS = {
+    form_type: [
+        (idx + 1,
+         item.get('category', 'GENERAL'),
+         item.get('desc', item.get('description', '')),
+         item.get('wt', item.get('weight', 1)),
+         1 if item.get('critical', item.get('is_critical', item.get('wt', 0) >= 4)) else 0)
+        for idx, item in enumerate(checklist)
+    ]
+    for form_type, checklist in FORM_CHECKLISTS.items()
+}
+
+
+# form_items statements built once per process with this database's placeholder
+_PH = get_placeholder()
+
+SEED_FORM_ITEM_SQL = f'''
+    INSERT INTO form_items
+    (form_template_id, item_order, category, description, weight, is_critical, active)
+    VALUES ({_PH}, {_PH}, {_PH}, {_PH}, {_PH}, {_PH}, 1)
+'''
+
+INSERT_FORM_ITEM_SQL = f'''
+    INSERT INTO form_items
+    (form_template_id, item_id, description, weight, is_critical, category, item_order)
+    VALUES ({_PH}, {_PH}, {_PH}, {_PH}, {_PH}, {_PH}, {_PH})
+'''
+
+UPDATE_FORM_ITEM_SQL = f'''
+    UPDATE form_items
+    SET description = {_PH},
+        weight = {_PH},
+        is_critical = {_PH},
+        item_order = {_PH}
+    WHERE id = {_PH}
+'''
+
+FIX_FORM_ITEM_SQL = f'''
+    INSERT INTO form_items (form_template_id, item_order, category, description, weight, is_critical, item_id)
+    VALUES ({_PH}, {_PH}, {_PH}, {_PH}, {_PH}, {_PH}, {_PH})
+'''
+
+
 def seed_missing_form_items():
     """Seed form_items for any form types that are missing items"""
-    from db_config import get_placeholder
-    ph = get_placeholder()
-
-    # Map form types to their hardcoded checklists
-    form_checklists = {
-        'Food Establishment': FOOD_CHECKLIST_ITEMS,
-        'Residential': RESIDENTIAL_CHECKLIST_ITEMS,
-        'Spirit Licence Premises': SPIRIT_LICENCE_CHECKLIST_ITEMS,
-        'Swimming Pool': SWIMMING_POOL_CHECKLIST_ITEMS,
-        'Small Hotel': SMALL_HOTELS_CHECKLIST_ITEMS,
-        'Barbershop': BARBERSHOP_CHECKLIST_ITEMS,
-        'Institutional': INSTITUTIONAL_CHECKLIST_ITEMS,
-        'Meat Processing': MEAT_PROCESSING_CHECKLIST_ITEMS,
-    }
+    ph = _PH
 
     try:
         conn = get_db_connection()
         c = conn.cursor()
 
-        for form_type, checklist in form_checklists.items():
-            # Get template ID
-            c.execute(f'SELECT id FROM form_templates WHERE form_type = {ph} AND active = 1', (form_type,))
-            template = c.fetchone()
-
-            if not template:
+        # One probe for every form type: its first active template and whether it has items
+        form_types = list(SEED_ROWS)
+        type_placeholders = ', '.join([ph] * len(form_types))
+        c.execute(f'''
+            SELECT ft.form_type, ft.id,
+                   EXISTS (SELECT 1 FROM form_items fi WHERE fi.form_template_id = ft.id) AS has_items
+            FROM form_templates ft
+            WHERE ft.active = 1
+            AND ft.form_type IN ({type_placeholders})
+            AND ft.id = (SELECT MIN(t.id) FROM form_templates t
+                         WHERE t.form_type = ft.form_type AND t.active = 1)
+        ''', form_types)
+        templates = {row[0]: (row[1], row[2]) for row in c.fetchall()}
+
+        for form_type, seed_rows in SEED_ROWS.items():
+            if form_type not in templates:
                 print(f"⚠️  No template for {form_type}")
                 continue
 
-            template_id = template[0]
+            template_id, has_items = templates[form_type]
 
-            # Check if items exist for this template
-            c.execute(f'SELECT COUNT(*) FROM form_items WHERE form_template_id = {ph}', (template_id,))
-            item_count = c.fetchone()[0]
+            if not has_items:
+                print(f"🌱 Seeding {len(seed_rows)} items for {form_type}...")
 
-            if item_count == 0:
-                print(f"🌱 Seeding {len(checklist)} items for {form_type}...")
+                c.executemany(SEED_FORM_ITEM_SQL, [(template_id,) + row for row in seed_rows])
 
-                for idx, item in enumerate(checklist):
-                    is_critical = 1 if item.get('critical', item.get('is_critical', item.get('wt', 0) >= 4)) else 0
-                    c.execute(f'''
-                        INSERT INTO form_items
-                        (form_template_id, item_order, category, description, weight, is_critical, active)
-                        VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, 1)
-                    ''', (
-                        template_id,
-                        idx + 1,
-                        item.get('category', 'GENERAL'),
-                        item.get('desc', item.get('description', '')),
-                        item.get('wt', item.get('weight', 1)),
-                        is_critical
-                    ))
-
-                print(f"✅ Seeded {len(checklist)} items for {form_type}")
+                print(f"✅ Seeded {len(seed_rows)} items for {form_type}")
 
         conn.commit()
         release_db_connection(conn)
@@ -12728,29 +12870,27 @@ def auto_migrate_form_fields():
                 ('received_by', 'Received By', 'text', 25, 0, 'Name of person receiving report', '', '', 'signatures')
             ]
 
-            # Get all templates
-            c.execute('SELECT id, form_type FROM form_templates WHERE active = 1')
-            templates = c.fetchall()
-
-            total_fields = 0
-            for row in templates:
-                template_id = row[0]
-                form_type = row[1] if hasattr(row, '__getitem__') and len(row) > 1 else row['form_type']
-
-                # Insert common fields for this template
-                for field in common_fields:
-                    c.execute(f'''
-                        INSERT INTO form_fields (
-                            form_template_id, field_name, field_label, field_type,
-                            field_order, required, placeholder, default_value, options,
-                            field_group, active, created_date
-                        ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-                    ''', (
-                        template_id, field[0], field[1], field[2], field[3], field[4],
-                        field[5], field[6], field[7], field[8], 1,
-                        datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    ))
-                    total_fields += 1
+            # Cross-join every active template with the common fields in one statement.
+            # created_date is filled by the column's DEFAULT CURRENT_TIMESTAMP
+            values_rows = ', '.join([f"({', '.join([ph] * 9)})"] * len(common_fields))
+            c.execute(f'''
+                INSERT INTO form_fields (
+                    form_template_id, field_name, field_label, field_type,
+                    field_order, required, placeholder, default_value, options,
+                    field_group, active
+                )
+                WITH v (field_name, field_label, field_type, field_order, required,
+                        placeholder, default_value, options, field_group) AS (
+                    VALUES {values_rows}
+                )
+                SELECT ft.id, v.field_name, v.field_label, v.field_type,
+                       v.field_order, v.required, v.placeholder, v.default_value, v.options,
+                       v.field_group, 1
+                FROM form_templates ft
+                CROSS JOIN v
+                WHERE ft.active = 1
+            ''', [value for field in common_fields for value in field])
+            total_fields = c.rowcount
 
             conn.commit()
             release_db_connection(conn)
@@ -12838,7 +12978,7 @@ def api_get_checklist_items():
         })
 
     release_db_connection(conn)
-    return jsonify({'success': True, 'items': items})
+    return fast_jsonify({'success': True, 'items': items})
 
 
 @app.route('/api/admin/update_checklist_items', methods=['POST'])
@@ -12858,8 +12998,7 @@ def api_update_checklist_items():
     conn = get_db_connection()
     c = conn.cursor()
 
-    from db_config import execute_query, get_placeholder
-    ph = get_placeholder()
+    from db_config import execute_query, execute_many
 
     try:
         # Get template ID
@@ -12872,30 +13011,27 @@ def api_update_checklist_items():
 
         template_id = template_row[0]
 
-        # Delete items that were marked for deletion
-        for item_id in deleted_ids:
-            execute_query(conn, 'DELETE FROM form_items WHERE id = ?', (item_id,))
-
-        # Process each item (update existing or insert new)
+        # Split items into inserts and updates so each kind goes out as one batch
+        new_rows = []
+        update_rows = []
         for idx, item in enumerate(items):
             if item.get('is_new', False):
-                # Insert new item
-                execute_query(conn, f'''INSERT INTO form_items
-                             (form_template_id, item_id, description, weight, is_critical, category, item_order)
-                             VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})''',
-                             (template_id, item['item_id'], item['description'],
-                              item['weight'], item['is_critical'], '', idx))
-            else:
-                # Update existing item
-                if item['id']:
-                    execute_query(conn, '''UPDATE form_items
-                                 SET description = ?,
-                                     weight = ?,
-                                     is_critical = ?,
-                                     item_order = ?
-                                 WHERE id = ?''',
-                                 (item['description'], item['weight'],
-                                  item['is_critical'], idx, item['id']))
+                new_rows.append((template_id, item['item_id'], item['description'],
+                                 item['weight'], item['is_critical'], '', idx))
+            elif item['id']:
+                update_rows.append((item['description'], item['weight'],
+                                    item['is_critical'], idx, item['id']))
+
+        # Delete items that were marked for deletion
+        if deleted_ids:
+            id_placeholders = ', '.join(['?'] * len(deleted_ids))
+            execute_query(conn, f'DELETE FROM form_items WHERE id IN ({id_placeholders})', tuple(deleted_ids))
+
+        # Insert new items
+        execute_many(conn, INSERT_FORM_ITEM_SQL, new_rows)
+
+        # Update existing items
+        execute_many(conn, UPDATE_FORM_ITEM_SQL, update_rows)
 
         # Update form template last_edited info
         admin_username = session.get('admin')
@@ -12917,6 +13053,67 @@ def api_update_checklist_items():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+# Advisory lock key shared by all workers so only one runs app-level migrations
+MIGRATION_LOCK_ID = 91231
+
+
+def acquire_migration_lock():
+    """
+    Try to become the single process that runs app-level migrations.
+
+    PostgreSQL: session-level pg_try_advisory_lock on a dedicated connection,
+    so workers on every host agree. SQLite: non-blocking flock on a lock file
+    next to the database (SQLite is local to one host anyway); without fcntl
+    (Windows) the lock is skipped and migrations run unlocked.
+
+    Returns a lock handle for release_migration_lock(), or None if another
+    worker already holds the lock.
+    """
+    if get_db_type() == 'postgresql':
+        conn = get_db_connection()
+        try:
+            c = conn.cursor()
+            c.execute('SELECT pg_try_advisory_lock(%s)', (MIGRATION_LOCK_ID,))
+            acquired = c.fetchone()[0]
+            conn.commit()
+        except Exception:
+            release_db_connection(conn, error=True)
+            raise
+        if acquired:
+            return conn
+        release_db_connection(conn)
+        return None
+
+    # Next to the database, so separate installs (and temp dirs) never share it
+    lock_file = open(os.getenv('SQLITE_DB_PATH', 'inspections.db') + '.migrations.lock', 'w')
+    if fcntl is None:
+        # No flock on Windows; the desktop build runs a single process anyway
+        return lock_file
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except IOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def release_migration_lock(lock):
+    """Release a handle returned by acquire_migration_lock()"""
+    if get_db_type() == 'postgresql':
+        try:
+            c = lock.cursor()
+            c.execute('SELECT pg_advisory_unlock(%s)', (MIGRATION_LOCK_ID,))
+            lock.commit()
+            release_db_connection(lock)
+        except Exception as e:
+            print(f"⚠️  Could not release migration lock: {e}")
+            release_db_connection(lock, error=True)
+    else:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        lock.close()
+
+
 # Initialize database and migrate checklists on app startup (works with Gunicorn)
 # Run in background thread to not block Gunicorn startup
 def init_app_migrations_async():
@@ -12928,6 +13125,16 @@ def init_app_migrations_async():
         # Give Gunicorn 3 seconds to bind to port first
         time.sleep(3)
 
+        # Only one worker runs migrations; the rest would just race on seeding
+        try:
+            lock = acquire_migration_lock()
+        except Exception as e:
+            print(f"⚠️ Could not acquire migration lock: {e}")
+            return
+        if lock is None:
+            print("⏭️  Another worker is running app-level migrations - skipping")
+            return
+
         try:
             print("🔄 Running app-level migrations...")
 
@@ -12980,12 +13187,17 @@ def init_app_migrations_async():
             print("✅ App-level migrations completed")
         except Exception as e:
             print(f"⚠️ App migration error: {e}")
+        finally:
+            release_migration_lock(lock)
 
     thread = threading.Thread(target=run_migrations, daemon=True)
     thread.start()
 
 # Start background migrations
-init_app_migrations_async()
+if RUN_MIGRATIONS:
+    init_app_migrations_async()
+else:
+    print("⏭️  RUN_MIGRATIONS=0 - skipping startup migrations in this process")
 
 
 @app.route('/force_init_tables')
@@ -13024,6 +13236,27 @@ def force_init_tables():
         """, 500
 
 
+# Name recorded in schema_migrations once the Food Establishment checklist fix has run
+FOOD_CHECKLIST_MIGRATION = 'food_establishment_44_items_v1'
+
+# Canonical 44-item Food Establishment checklist, read only when the fix is needed
+FOOD_CHECKLIST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'food_establishment_v1.json')
+
+# sha256 of the item descriptions in item_order, joined with '|'
+FOOD_CHECKLIST_SHA256 = 'daf245771691f23ebfd70e42881ccb9b5067a1dde34314cfaebfb1f0460aec68'
+
+
+def food_checklist_digest(descriptions):
+    """Hash checklist descriptions the same way FOOD_CHECKLIST_SHA256 was built"""
+    return hashlib.sha256('|'.join(descriptions).encode('utf-8')).hexdigest()
+
+
+def load_food_checklist():
+    """Load the canonical Food Establishment checklist items from JSON"""
+    with open(FOOD_CHECKLIST_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 if __name__ == '__main__':
     # AUTO-FIX: Run database migrations on startup
     print("\n🔄 Running database migrations...")
@@ -13039,78 +13272,45 @@ if __name__ == '__main__':
         c = conn.cursor()
         ph = get_placeholder()
 
+        # Record applied one-off fixes so later startups skip the checklist probe
+        c.execute('''CREATE TABLE IF NOT EXISTS schema_migrations
+                     (name TEXT PRIMARY KEY,
+                      applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+        conn.commit()
+
+        c.execute(f"SELECT 1 FROM schema_migrations WHERE name = {ph}", (FOOD_CHECKLIST_MIGRATION,))
+        already_applied = c.fetchone() is not None
+
         # Check if Food Establishment has correct item #1
-        c.execute(f"SELECT id FROM form_templates WHERE form_type = {ph}", ('Food Establishment',))
-        template = c.fetchone()
+        template = None
+        if not already_applied:
+            c.execute(f"SELECT id FROM form_templates WHERE form_type = {ph}", ('Food Establishment',))
+            template = c.fetchone()
 
         if template:
             template_id = template[0]
-            c.execute(f"SELECT description FROM form_items WHERE form_template_id = {ph} AND item_order = 1", (template_id,))
-            item_1 = c.fetchone()
+            c.execute(f"SELECT description FROM form_items WHERE form_template_id = {ph} ORDER BY item_order", (template_id,))
+            descriptions = [row[0] or '' for row in c.fetchall()]
 
-            # If item #1 is wrong or missing, fix the entire checklist
-            if not item_1 or 'Source, Sound Condition, No Spoilage' not in item_1[0]:
+            # If any item is wrong or missing, fix the entire checklist
+            if food_checklist_digest(descriptions) != FOOD_CHECKLIST_SHA256:
                 print("\n🔧 AUTO-FIX: Correcting Food Establishment checklist...")
 
                 # Delete old items
                 c.execute(f"DELETE FROM form_items WHERE form_template_id = {ph}", (template_id,))
 
                 # Insert correct 44 items
-                CORRECT_ITEMS = [
-                    (1, "FOOD", "Source, Sound Condition, No Spoilage", 5, 0),
-                    (2, "FOOD", "Original Container, Properly Labeled", 1, 0),
-                    (3, "FOOD PROTECTION", "Potentially Hazardous Food Meets Temcjblperature Requirements During Storage, Preparation, Display, Service, Transportation", 5, 0),
-                    (4, "FOOD PROTECTION", "Facilities to Maintain Product Temperature", 4, 0),
-                    (5, "FOOD PROTECTION", "Thermometers Provided and Conspicuous", 1, 0),
-                    (6, "FOOD PROTECTION", "Potentially Hazardous Food Properly Thawed", 2, 0),
-                    (7, "FOOD PROTECTION", "Unwrapped and Potentially Hazardous Food Not Re-Served", 4, 0),
-                    (8, "FOOD PROTECTION", "Food Protection During Storage, Preparation, Display, Service, Transportation", 2, 0),
-                    (9, "FOOD PROTECTION", "Handling of Food (Ice) Minimized", 1, 0),
-                    (10, "FOOD PROTECTION", "In Use Food (Ice) Dispensing Utensils Properly Stored", 1, 0),
-                    (11, "FOOD EQUIPMENT & UTENSILS", "Food Contact Surfaces Designed, Constructed, Maintained, Installed, Located", 2, 0),
-                    (12, "FOOD EQUIPMENT & UTENSILS", "Non-Food Contact Surfaces Designed, Constructed, Maintained, Installed, Located", 1, 0),
-                    (13, "FOOD EQUIPMENT & UTENSILS", "Dishwashing Facilities Designed, Constructed, Maintained, Installed, Located, Operated", 2, 0),
-                    (14, "FOOD EQUIPMENT & UTENSILS", "Accurate Thermometers, Chemical Test Kits Provided", 1, 0),
-                    (15, "FOOD EQUIPMENT & UTENSILS", "Single Service Articles Storage, Dispensing", 1, 0),
-                    (16, "FOOD EQUIPMENT & UTENSILS", "No Re-Use of Single Serve Articles", 2, 0),
-                    (17, "FOOD EQUIPMENT & UTENSILS", "Pre-Flushed, Scraped, Soaked", 1, 0),
-                    (18, "FOOD EQUIPMENT & UTENSILS", "Wash, Rinse Water Clean, Proper Temperature", 2, 0),
-                    (19, "FOOD EQUIPMENT & UTENSILS", "Sanitization Rinse Clean, Temperature, Concentration, Exposure Time, Equipment, Utensils Sanitized", 4, 0),
-                    (20, "FOOD EQUIPMENT & UTENSILS", "Wiping Cloths Clean, Use Restricted", 1, 0),
-                    (21, "FOOD EQUIPMENT & UTENSILS", "Food Contact Surfaces of Equipment and Utensils Clean, Free of Abrasives, Detergents", 2, 0),
-                    (22, "FOOD EQUIPMENT & UTENSILS", "Non-Food Contact Surfaces of Equipment and Utensils Clean", 1, 0),
-                    (23, "FOOD EQUIPMENT & UTENSILS", "Storage, Handling of Clean Equipment/Utensils", 1, 0),
-                    (24, "TOILET & HANDWASHING FACILITIES", "Number, Convenient, Accessible, Designed, Installed", 4, 0),
-                    (25, "TOILET & HANDWASHING FACILITIES", "Toilet Rooms Enclosed, Self-Closing Doors, Fixtures: Good Repair, Clean, Hand Cleanser, Sanitary Towels, Hand Drying Devices Provided, Proper Waste Receptacles", 2, 0),
-                    (26, "SOLID WASTE MANAGEMENT", "Containers or Receptacles: Covered, Adequate Number, Insect/Rodent Proof, Frequency, Clean", 2, 0),
-                    (27, "SOLID WASTE MANAGEMENT", "Outside Storage Area Enclosures Properly Constructed, Clean, Controlled Incineration", 1, 0),
-                    (28, "INSECT, RODENT, ANIMAL CONTROL", "Evidence of Insects/Rodents - Outer Openings, Protected, No Birds, Turtles, Other Animals", 4, 0),
-                    (29, "PERSONNEL", "Personnel with Infections Restricted", 5, 0),
-                    (30, "PERSONNEL", "Hands Washed and Clean, Good Hygienic Practices", 5, 0),
-                    (31, "PERSONNEL", "Clean Clothes, Hair Restraints", 2, 0),
-                    (32, "LIGHTING", "Lighting Provided as Required, Fixtures Shielded", 1, 0),
-                    (33, "VENTILATION", "Rooms and Equipment - Venting as Required", 1, 0),
-                    (34, "DRESSING ROOMS", "Rooms Clean, Lockers Provided, Facilities Clean", 1, 0),
-                    (35, "WATER", "Water Source Safe, Hot & Cold Under Pressure", 5, 0),
-                    (36, "SEWAGE", "Sewage and Waste Water Disposal", 4, 0),
-                    (37, "PLUMBING", "Installed, Maintained", 1, 0),
-                    (38, "PLUMBING", "Cross Connection, Back Siphonage, Backflow", 5, 0),
-                    (39, "FLOORS, WALLS, & CEILINGS", "Floors: Constructed, Drained, Clean, Good Repair, Covering Installation, Dustless Cleaning Methods", 1, 0),
-                    (40, "FLOORS, WALLS, & CEILINGS", "Walls, Ceiling, Attached Equipment: Constructed, Good Repair, Clean Surfaces, Dustless Cleaning Methods", 1, 0),
-                    (41, "OTHER OPERATIONS", "Toxic Items Properly Stored, Labeled, Used", 5, 0),
-                    (42, "OTHER OPERATIONS", "Premises Maintained Free of Litter, Unnecessary Articles, Cleaning Maintenance Equipment Properly Stored, Authorized Personnel", 1, 0),
-                    (43, "OTHER OPERATIONS", "Complete Separation for Living/Sleeping Quarters, Laundry", 1, 0),
-                    (44, "OTHER OPERATIONS", "Clean, Soiled Linen Properly Stored", 1, 0),
-                ]
-
-                for item_order, category, description, weight, is_critical in CORRECT_ITEMS:
-                    c.execute(f"""
-                        INSERT INTO form_items (form_template_id, item_order, category, description, weight, is_critical, item_id)
-                        VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-                    """, (template_id, item_order, category, description, weight, is_critical, str(item_order)))
+                correct_items = load_food_checklist()
+                c.executemany(FIX_FORM_ITEM_SQL, [
+                    (template_id, item['order'], item['category'], item['desc'], item['wt'], item['crit'], str(item['order']))
+                    for item in correct_items
+                ])
 
                 conn.commit()
-                print(f"✅ AUTO-FIX: Food Establishment checklist now has 44 correct items including item #1")
+                print(f"✅ AUTO-FIX: Food Establishment checklist now has {len(correct_items)} correct items including item #1")
+
+            c.execute(f"INSERT INTO schema_migrations (name) VALUES ({ph})", (FOOD_CHECKLIST_MIGRATION,))
+            conn.commit()
 
         release_db_connection(conn)
     except Exception as e:
@@ -13141,7 +13341,7 @@ def initialize_database():
                 role = EXCLUDED.role,
                 email = EXCLUDED.email,
                 parish = EXCLUDED.parish
-        """, ('admin', 'Admin901!secure', 'admin', 'admin@inspection.local', 'Westmoreland'))
+        """, ('admin', hash_password('Admin901!secure'), 'admin', 'admin@inspection.local', 'Westmoreland'))
 
         conn.commit()
         print("✅ Admin user created successfully!")
@@ -5,13 +5,87 @@ Tracks all important actions in the system
 
 import os
 import json
+import mmap
+import time
+import queue
+import atexit
+import threading
+from collections import Counter
 from datetime import datetime
+from itertools import islice
 from integrity_check import get_installation_id
 
+# requests is optional; without it audit entries stay in the local log only
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+# orjson is optional; fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps_line(entry):
+    """Encode an audit entry as one UTF-8 JSONL line (newline included)"""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry) + '\n').encode('utf-8')
+
+def _loads(line):
+    """Decode one JSONL line (bytes or str)"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
 AUDIT_LOG_FILE = 'audit_log.jsonl'
+AUDIT_STATS_FILE = 'audit_log_stats.json'
+AUDIT_STATS_BATCH_SIZE = 10000  # entries parsed per Counter update
 AUDIT_SERVER = os.environ.get('ZOZI_LICENSE_SERVER', 'https://api.zozi-inspections.com')
+LICENSE_KEY = os.environ.get('ZOZI_LICENSE_KEY', 'none')
+
+# Local audit writes go through one buffered file handle per process
+AUDIT_BUFFER_SIZE = 65536
+AUDIT_LOG_PERMISSIONS = 0o600  # owner read/write only, applied when the log is created
+AUDIT_FLUSH_INTERVAL = 1.0  # seconds
+
+_audit_lock = threading.Lock()
+_audit_writer = None
+_audit_flusher = None
+
+# Server sends are handed to a background thread so log_action never waits on the network
+AUDIT_QUEUE_SIZE = 10000
+AUDIT_BATCH_SIZE = 64
+AUDIT_BATCH_TIMEOUT = 1.0  # seconds
+AUDIT_SHUTDOWN_TIMEOUT = 5.0  # seconds spent sending leftovers at exit
+
+_audit_queue = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+_audit_sender = None
+_audit_sender_lock = threading.Lock()
+_audit_session = None
+
+def _read_installation_id():
+    try:
+        return get_installation_id()
+    except Exception as e:
+        print(f"⚠️ Could not read installation ID for audit log: {e}")
+        return 'unknown'
+
+# Fixed for the life of the process, so read once instead of per entry
+INSTALLATION_ID = _read_installation_id()
 
-def log_action(action_type, user, details=None, local_only=False):
+def reload_env():
+    """Re-read the installation ID, audit server and license key (for tests or config changes)"""
+    global INSTALLATION_ID, AUDIT_SERVER, LICENSE_KEY
+
+    INSTALLATION_ID = _read_installation_id()
+    AUDIT_SERVER = os.environ.get('ZOZI_LICENSE_SERVER', 'https://api.zozi-inspections.com')
+    LICENSE_KEY = os.environ.get('ZOZI_LICENSE_KEY', 'none')
+
+def log_action(action_type, user, details=None, local_only=False, flush=False):
     """
     Log an action to local file and optionally send to server
 
@@ -20,20 +94,21 @@ def log_action(action_type, user, details=None, local_only=False):
         user: Username or identifier of who performed the action
         details: Dictionary with additional information
         local_only: If True, don't send to server (for sensitive data)
+        flush: If True, flush and fsync the local log before returning
 
     Returns:
         Dict of the log entry created
     """
     log_entry = {
         'timestamp': datetime.utcnow().isoformat(),
-        'installation_id': get_installation_id(),
+        'installation_id': INSTALLATION_ID,
         'action_type': action_type,
         'user': user,
         'details': details or {},
     }
 
     # Always log locally
-    write_local_audit_log(log_entry)
+    write_local_audit_log(log_entry, flush=flush)
 
     # Send to server unless local_only
     if not local_only:
@@ -41,29 +116,132 @@ def log_action(action_type, user, details=None, local_only=False):
 
     return log_entry
 
-def write_local_audit_log(entry):
+def _get_audit_writer():
+    """Open the shared buffered audit log writer (caller holds _audit_lock)"""
+    global _audit_writer, _audit_flusher
+
+    if _audit_writer is None:
+        # O_APPEND makes every flushed write land at the current end of file,
+        # so whole-line flushes from several workers never overwrite each other
+        fd = os.open(AUDIT_LOG_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, AUDIT_LOG_PERMISSIONS)
+        _audit_writer = os.fdopen(fd, 'ab', buffering=AUDIT_BUFFER_SIZE)
+
+    if _audit_flusher is None:
+        # Push buffered entries to disk at least every AUDIT_FLUSH_INTERVAL seconds
+        _audit_flusher = threading.Thread(target=_flush_periodically, daemon=True)
+        _audit_flusher.start()
+
+    return _audit_writer
+
+def _flush_periodically():
+    while True:
+        time.sleep(AUDIT_FLUSH_INTERVAL)
+        flush_audit_log()
+
+def flush_audit_log(fsync=False):
+    """Write any buffered audit entries to disk"""
+    try:
+        with _audit_lock:
+            if _audit_writer is None:
+                return
+            _audit_writer.flush()
+            if fsync:
+                os.fsync(_audit_writer.fileno())
+    except Exception as e:
+        print(f"⚠️ Failed to flush local audit log: {e}")
+
+def close_audit_log():
+    """Flush and close the audit log writer"""
+    global _audit_writer
+
+    flush_audit_log()
+    with _audit_lock:
+        if _audit_writer is not None:
+            try:
+                _audit_writer.close()
+            except Exception:
+                pass
+            _audit_writer = None
+
+atexit.register(close_audit_log)
+
+def write_local_audit_log(entry, flush=False):
     """Write audit entry to local JSONL file"""
     try:
         # Append to JSONL file (one JSON object per line)
-        with open(AUDIT_LOG_FILE, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+        line = _dumps_line(entry)
+        with _audit_lock:
+            _get_audit_writer().write(line)
+
+        if flush:
+            flush_audit_log(fsync=True)
 
     except Exception as e:
         print(f"⚠️ Failed to write local audit log: {e}")
 
 def send_audit_to_server(entry):
-    """Send audit entry to your monitoring server"""
+    """Queue audit entry for delivery to your monitoring server"""
+    global _audit_sender
+
+    # Remove sensitive data before sending
+    safe_entry = sanitize_audit_entry(entry)
+
+    with _audit_sender_lock:
+        if _audit_sender is None:
+            _audit_sender = threading.Thread(target=_send_queued_audits, daemon=True)
+            _audit_sender.start()
+
     try:
-        import requests
+        _audit_queue.put_nowait(safe_entry)
+    except queue.Full:
+        # Entry is already in the local log; drop the remote copy
+        print("⚠️ Audit send queue full - keeping entry in local log only")
+
+def _send_queued_audits():
+    """Background worker: drain the send queue in batches of up to AUDIT_BATCH_SIZE"""
+    while True:
+        batch = [_audit_queue.get()]
+        deadline = time.monotonic() + AUDIT_BATCH_TIMEOUT
+        while len(batch) < AUDIT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_audit_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        for safe_entry in batch:
+            _post_audit_entry(safe_entry)
+
+def _get_audit_session():
+    """Shared keep-alive HTTP session for audit sends"""
+    global _audit_session
+
+    if _audit_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _audit_session = session
 
-        # Remove sensitive data before sending
-        safe_entry = sanitize_audit_entry(entry)
+    return _audit_session
 
-        requests.post(
+def _post_audit_entry(safe_entry):
+    """POST one sanitized audit entry to the monitoring server"""
+    try:
+        if requests is None:
+            raise RuntimeError("requests is not installed")
+
+        _get_audit_session().post(
             f"{AUDIT_SERVER}/api/audit",
             json=safe_entry,
             headers={
-                'X-License-Key': os.environ.get('ZOZI_LICENSE_KEY', 'none')
+                'X-License-Key': LICENSE_KEY
             },
             timeout=5
         )
@@ -76,23 +254,101 @@ def send_audit_to_server(entry):
             'error': str(e)
         })
 
+def _drain_audit_queue():
+    """Send whatever is still queued at interpreter exit, within AUDIT_SHUTDOWN_TIMEOUT"""
+    deadline = time.monotonic() + AUDIT_SHUTDOWN_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            safe_entry = _audit_queue.get_nowait()
+        except queue.Empty:
+            break
+        _post_audit_entry(safe_entry)
+
+# Registered after close_audit_log, so it runs first (atexit is LIFO) and
+# send failures can still be written to the local log
+atexit.register(_drain_audit_queue)
+
+# Detail keys redacted before an entry leaves this machine
+SENSITIVE_FIELDS = frozenset({'password', 'password_hash', 'ssn', 'credit_card'})
+
 def sanitize_audit_entry(entry):
     """Remove sensitive data before sending to server"""
+    details = entry.get('details')
+    if not isinstance(details, dict):
+        return entry
+
+    sensitive = SENSITIVE_FIELDS & details.keys()
+    if not sensitive:
+        # Nothing to redact - send the entry as-is without copying
+        return entry
+
+    # Redact sensitive fields on copies so the local log keeps the original
     safe_entry = entry.copy()
+    safe_entry['details'] = {**details, **{field: '[REDACTED]' for field in sensitive}}
 
-    # Remove passwords from details
-    if 'details' in safe_entry and isinstance(safe_entry['details'], dict):
-        details = safe_entry['details'].copy()
+    return safe_entry
 
-        # Redact sensitive fields
-        sensitive_fields = ['password', 'password_hash', 'ssn', 'credit_card']
-        for field in sensitive_fields:
-            if field in details:
-                details[field] = '[REDACTED]'
+# Block size for reading the audit log backwards from the end
+AUDIT_TAIL_BLOCK_SIZE = 65536
+
+def _iter_lines_reversed(path):
+    """Yield the lines of a file as bytes, last line first, reading 64KB blocks from the end"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        partial = b''
+
+        while pos > 0:
+            read_size = min(AUDIT_TAIL_BLOCK_SIZE, pos)
+            pos -= read_size
+            f.seek(pos)
+            block = f.read(read_size) + partial
+
+            lines = block.split(b'\n')
+            # The first piece may continue in the previous block
+            partial = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line
+
+        if partial:
+            yield partial
+
+def _filter_needle(value):
+    """
+    Bytes that must appear in a raw JSONL line whose field equals value
 
-        safe_entry['details'] = details
+    Lines without it can be skipped before parsing. Only ASCII strings are
+    used, since json and orjson encode those identically.
+    """
+    if not isinstance(value, str) or not value.isascii():
+        return None
+    return json.dumps(value).encode('ascii')
 
-    return safe_entry
+def iter_audit_entries(action_type=None, user=None):
+    """Lazily yield audit entries matching the filters, most recent first"""
+    needles = [n for n in (_filter_needle(action_type) if action_type else None,
+                           _filter_needle(user) if user else None) if n]
+
+    # Walk from the end of the file so only the newest entries are read
+    for line in _iter_lines_reversed(AUDIT_LOG_FILE):
+        # Cheap substring check before paying for a full parse
+        if needles and not all(needle in line for needle in needles):
+            continue
+
+        try:
+            entry = _loads(line)
+        except json.JSONDecodeError:
+            continue
+
+        # Apply filters
+        if action_type and entry.get('action_type') != action_type:
+            continue
+
+        if user and entry.get('user') != user:
+            continue
+
+        yield entry
 
 def read_audit_log(limit=100, action_type=None, user=None):
     """
@@ -104,44 +360,23 @@ def read_audit_log(limit=100, action_type=None, user=None):
         user: Filter by user
 
     Returns:
-        List of audit log entries
+        List of audit log entries, most recent first
     """
-    entries = []
+    flush_audit_log()
 
     try:
         if not os.path.exists(AUDIT_LOG_FILE):
             return []
 
-        with open(AUDIT_LOG_FILE, 'r') as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-
-                    # Apply filters
-                    if action_type and entry.get('action_type') != action_type:
-                        continue
-
-                    if user and entry.get('user') != user:
-                        continue
-
-                    entries.append(entry)
-
-                    # Limit results
-                    if len(entries) >= limit:
-                        break
-
-                except json.JSONDecodeError:
-                    continue
+        # Stops reading the file as soon as `limit` entries have matched
+        return list(islice(iter_audit_entries(action_type, user), limit))
 
     except Exception as e:
         print(f"Error reading audit log: {e}")
+        return []
 
-    # Return most recent first
-    return list(reversed(entries))
-
-def get_audit_stats():
-    """Get statistics about audit log"""
-    stats = {
+def _empty_audit_stats():
+    return {
         'total_entries': 0,
         'actions_by_type': {},
         'actions_by_user': {},
@@ -149,32 +384,92 @@ def get_audit_stats():
         'last_entry': None
     }
 
+def _load_stats_cache():
+    """Load (stats, offset) saved by the last get_audit_stats call"""
     try:
-        if not os.path.exists(AUDIT_LOG_FILE):
+        with open(AUDIT_STATS_FILE, 'rb') as f:
+            cache = _loads(f.read())
+        return cache['stats'], int(cache['offset'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return _empty_audit_stats(), 0
+
+def _save_stats_cache(stats, offset):
+    """Persist stats atomically so concurrent readers never see a partial file"""
+    tmp_path = f"{AUDIT_STATS_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_dumps_line({'stats': stats, 'offset': offset}))
+        os.replace(tmp_path, AUDIT_STATS_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️ Failed to save audit stats cache: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _stats_key(value):
+    """Counter key for an entry field: always a string, so cached and fresh counts agree"""
+    return 'unknown' if value is None else str(value)
+
+def get_audit_stats():
+    """
+    Get statistics about audit log
+
+    Counts are cached in AUDIT_STATS_FILE together with the byte offset they
+    cover, so each call only parses entries appended since the last one.
+    """
+    stats = _empty_audit_stats()
+
+    flush_audit_log()
+
+    try:
+        if not os.path.exists(AUDIT_LOG_FILE) or os.path.getsize(AUDIT_LOG_FILE) == 0:
             return stats
 
-        with open(AUDIT_LOG_FILE, 'r') as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    stats['total_entries'] += 1
+        stats, offset = _load_stats_cache()
+        if offset > os.path.getsize(AUDIT_LOG_FILE):
+            # Log was truncated or replaced - rebuild from the start
+            stats, offset = _empty_audit_stats(), 0
+
+        with open(AUDIT_LOG_FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.seek(offset)
+
+            def new_entries():
+                nonlocal offset
+                for line in iter(mm.readline, b''):
+                    if not line.endswith(b'\n'):
+                        # Entry still being written; pick it up next time
+                        break
+                    offset += len(line)
+
+                    try:
+                        yield _loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+
+            actions_by_type = Counter(stats['actions_by_type'])
+            actions_by_user = Counter(stats['actions_by_user'])
+            entries = new_entries()
 
-                    # Count by action type
-                    action_type = entry.get('action_type', 'unknown')
-                    stats['actions_by_type'][action_type] = stats['actions_by_type'].get(action_type, 0) + 1
+            # Count in batches so Counter.update does the tallying in C
+            while True:
+                batch = list(islice(entries, AUDIT_STATS_BATCH_SIZE))
+                if not batch:
+                    break
 
-                    # Count by user
-                    user = entry.get('user', 'unknown')
-                    stats['actions_by_user'][user] = stats['actions_by_user'].get(user, 0) + 1
+                stats['total_entries'] += len(batch)
+                actions_by_type.update(_stats_key(entry.get('action_type')) for entry in batch)
+                actions_by_user.update(_stats_key(entry.get('user')) for entry in batch)
 
-                    # Track first and last
-                    if stats['first_entry'] is None:
-                        stats['first_entry'] = entry.get('timestamp')
+                # Track first and last
+                if stats['first_entry'] is None:
+                    stats['first_entry'] = batch[0].get('timestamp')
+                stats['last_entry'] = batch[-1].get('timestamp')
 
-                    stats['last_entry'] = entry.get('timestamp')
+            stats['actions_by_type'] = dict(actions_by_type)
+            stats['actions_by_user'] = dict(actions_by_user)
 
-                except json.JSONDecodeError:
-                    continue
+        _save_stats_cache(stats, offset)
 
     except Exception as e:
         print(f"Error getting audit stats: {e}")
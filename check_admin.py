@@ -8,9 +8,17 @@ conn = get_db_connection()
 cursor = conn.cursor()
 
 try:
-    # Check for admin users
-    cursor.execute("SELECT id, username, email, role, parish FROM users WHERE role = 'admin'")
-    admins = cursor.fetchall()
+    # Admin users plus the total user count in one round trip. The LEFT JOIN
+    # keeps a single (total, NULL...) row when there are no admins.
+    cursor.execute("""
+        SELECT t.total, u.id, u.username, u.email, u.role, u.parish
+        FROM (SELECT COUNT(*) AS total FROM users) t
+        LEFT JOIN users u ON u.role = 'admin'
+        ORDER BY u.id
+    """)
+    rows = cursor.fetchall()
+    total = rows[0][0] if rows else 0
+    admins = [row[1:] for row in rows if row[1] is not None]
 
     print("=" * 60)
     print("ADMIN USERS CHECK")
@@ -31,8 +39,6 @@ try:
             print()
 
     # Check all users
-    cursor.execute("SELECT COUNT(*) FROM users")
-    total = cursor.fetchone()[0]
     print(f"Total users in database: {total}")
 
     print("=" * 60)
@@ -19,16 +19,55 @@ def check_counts():
         ('meat_processing_inspections', 'Meat Processing')
     ]
 
+    # One round trip for every table's count and its 5 most recent records
+    counts_sql = " UNION ALL ".join(
+        f"SELECT '{table}', COUNT(*) FROM {table}" for table, _ in tables
+    )
+    recent_sql = " UNION ALL ".join(
+        f"SELECT * FROM (SELECT '{table}' AS tbl, id, created_at FROM {table} "
+        f"ORDER BY created_at DESC LIMIT 5) AS recent_{i}"
+        for i, (table, _) in enumerate(tables)
+    )
+
+    counts = {}
+    recent = {table: [] for table, _ in tables}
+    errors = {}
+
+    try:
+        c.execute(counts_sql)
+        counts = dict(c.fetchall())
+        c.execute(recent_sql)
+        for table, record_id, created_at in c.fetchall():
+            recent[table].append((record_id, created_at))
+    except Exception:
+        # A table is missing or broken - fall back to per-table queries to find which
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        counts, recent = {}, {table: [] for table, _ in tables}
+        for table, _ in tables:
+            try:
+                c.execute(f"SELECT COUNT(*) FROM {table}")
+                counts[table] = c.fetchone()[0]
+                c.execute(f"SELECT id, created_at FROM {table} ORDER BY created_at DESC LIMIT 5")
+                recent[table] = c.fetchall()
+            except Exception as e:
+                errors[table] = e
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+
     total_count = 0
 
     for table, description in tables:
-        try:
-            c.execute(f"SELECT COUNT(*) FROM {table}")
-            count = c.fetchone()[0]
-            total_count += count
-            print(f"{description:45} {count:5} records")
-        except Exception as e:
-            print(f"{description:45} ERROR: {e}")
+        if table in errors:
+            print(f"{description:45} ERROR: {errors[table]}")
+            continue
+        count = counts.get(table, 0)
+        total_count += count
+        print(f"{description:45} {count:5} records")
 
     print("=" * 60)
     print(f"{'TOTAL INSPECTIONS':45} {total_count:5} records")
@@ -39,15 +78,14 @@ def check_counts():
     print("-" * 60)
 
     for table, description in tables:
-        try:
-            c.execute(f"SELECT id, created_at FROM {table} ORDER BY created_at DESC LIMIT 5")
-            records = c.fetchall()
-            if records:
-                print(f"\n{description}:")
-                for record in records:
-                    print(f"  ID: {record[0]}, Created: {record[1]}")
-        except Exception as e:
-            print(f"\n{description}: ERROR - {e}")
+        if table in errors:
+            print(f"\n{description}: ERROR - {errors[table]}")
+            continue
+        records = recent[table]
+        if records:
+            print(f"\n{description}:")
+            for record in records:
+                print(f"  ID: {record[0]}, Created: {record[1]}")
 
     conn.close()
 
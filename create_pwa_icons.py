@@ -5,8 +5,16 @@ Generates properly sized icons with rounded corners for iOS and Android
 """
 
 from PIL import Image, ImageDraw, ImageFilter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import os
 
+# numpy is optional; without it masks are rasterized with ImageDraw
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def create_rounded_rectangle_mask(size, radius):
     """Create a rounded rectangle mask"""
     mask = Image.new('L', size, 0)
@@ -21,25 +29,64 @@ def create_rounded_rectangle_mask(size, radius):
 
     return mask
 
-def create_pwa_icon(input_path, output_path, size, corner_radius_percent=8):
+def create_rounded_square_mask_numpy(size, radius):
     """
-    Create a PWA icon with slightly rounded corners (square with soft edges)
+    Create a square rounded-corner mask from a vectorized numpy distance test
 
-    Args:
-        input_path: Path to input image (inspec.JPG)
-        output_path: Path to save output icon
-        size: Size in pixels (e.g., 192, 512)
-        corner_radius_percent: Percentage of size to use for corner radius (default 8% for slight curve)
+    Only one radius x radius corner is computed (pixel centres within radius of
+    the corner circle centre are opaque); it is flipped into the other three
+    corners of an otherwise opaque mask.
     """
-    print(f"Creating {size}x{size} icon...")
+    mask = Image.new('L', (size, size), 255)
+    if radius <= 0:
+        return mask
+
+    offsets = radius - (np.arange(radius) + 0.5)
+    inside = offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius ** 2
+    corner = Image.fromarray(np.where(inside, 255, 0).astype(np.uint8), 'L')
+
+    mask.paste(corner, (0, 0))
+    mask.paste(corner.transpose(Image.Transpose.FLIP_LEFT_RIGHT), (size - radius, 0))
+    mask.paste(corner.transpose(Image.Transpose.FLIP_TOP_BOTTOM), (0, size - radius))
+    mask.paste(corner.transpose(Image.Transpose.ROTATE_180), (size - radius, size - radius))
+    return mask
+
+# Masks are drawn once at this size and downscaled for each icon
+MASTER_MASK_SIZE = 1024
+
+@lru_cache(maxsize=None)
+def master_rounded_mask(corner_radius_percent):
+    """High-resolution rounded mask for one corner radius percentage"""
+    radius = int(MASTER_MASK_SIZE * (corner_radius_percent / 100))
+    if np is not None:
+        return create_rounded_square_mask_numpy(MASTER_MASK_SIZE, radius)
+    return create_rounded_rectangle_mask((MASTER_MASK_SIZE, MASTER_MASK_SIZE), radius)
 
-    # Open the original image
+def rounded_mask(size, corner_radius_percent):
+    """Rounded mask for a square icon, downscaled from the cached master mask"""
+    return master_rounded_mask(corner_radius_percent).resize((size, size), Image.Resampling.LANCZOS)
+
+@lru_cache(maxsize=1)
+def load_source_image(input_path):
+    """Open and decode the source logo once per process"""
     img = Image.open(input_path)
 
     # Convert to RGBA if not already
     if img.mode != 'RGBA':
         img = img.convert('RGBA')
 
+    return img
+
+@lru_cache(maxsize=1)
+def display_icon_base(input_path):
+    """
+    Crop the source logo to the square icon content used by every display icon
+
+    The crop box is the same for all sizes, so each icon is resized from this
+    small square instead of from the full image.
+    """
+    img = load_source_image(input_path)
+
     # Get original dimensions
     width, height = img.size
 
@@ -63,7 +110,6 @@ def create_pwa_icon(input_path, output_path, size, corner_radius_percent=8):
     # Make it square (in case crop wasn't perfectly square)
     crop_width = crop_box[2] - crop_box[0]
     crop_height = crop_box[3] - crop_box[1]
-    square_size = min(crop_width, crop_height)
 
     # Center crop to square
     if crop_width > crop_height:
@@ -73,14 +119,36 @@ def create_pwa_icon(input_path, output_path, size, corner_radius_percent=8):
         diff = crop_height - crop_width
         img_cropped = img_cropped.crop((0, diff // 2, crop_width, crop_height - diff // 2))
 
-    # Resize to target size with high-quality resampling
-    img_resized = img_cropped.resize((size, size), Image.Resampling.LANCZOS)
+    return img_cropped
+
+@lru_cache(maxsize=1)
+def maskable_icon_base(input_path):
+    """Crop the source logo to the main content used by maskable icons"""
+    img = load_source_image(input_path)
 
-    # Calculate corner radius (8% = slight curve, not too rounded)
-    corner_radius = int(size * (corner_radius_percent / 100))
+    # Crop to focus on main content
+    width, height = img.size
+    crop_margin = int(width * 0.15)
+    crop_box = (crop_margin, crop_margin, width - crop_margin, height - crop_margin)
+    return img.crop(crop_box)
 
-    # Create rounded mask with slight curves
-    mask = create_rounded_rectangle_mask((size, size), corner_radius)
+def create_pwa_icon(base_img, output_path, size, corner_radius_percent=8):
+    """
+    Create a PWA icon with slightly rounded corners (square with soft edges)
+
+    Args:
+        base_img: Square RGBA icon content (see display_icon_base)
+        output_path: Path to save output icon
+        size: Size in pixels (e.g., 192, 512)
+        corner_radius_percent: Percentage of size to use for corner radius (default 8% for slight curve)
+    """
+    print(f"Creating {size}x{size} icon...")
+
+    # Resize to target size with high-quality resampling
+    img_resized = base_img.resize((size, size), Image.Resampling.LANCZOS)
+
+    # Rounded mask with slight curves (8% = slight curve, not too rounded)
+    mask = rounded_mask(size, corner_radius_percent)
 
     # Create output image with dark background (matching the icon style)
     output = Image.new('RGBA', (size, size), (26, 26, 46, 255))  # Dark blue-gray background
@@ -95,29 +163,16 @@ def create_pwa_icon(input_path, output_path, size, corner_radius_percent=8):
 
     return output
 
-def create_square_icon(input_path, output_path, size):
+def create_square_icon(base_img, output_path, size):
     """
     Create a square icon without rounded corners (for maskable icons)
     iOS and Android will apply their own masks
+
+    Args:
+        base_img: Cropped RGBA icon content (see maskable_icon_base)
     """
     print(f"Creating {size}x{size} square icon (maskable)...")
 
-    # Open the original image
-    img = Image.open(input_path)
-
-    # Convert to RGBA
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-
-    # Crop to focus on main content
-    width, height = img.size
-    crop_margin = int(width * 0.15)
-    crop_box = (crop_margin, crop_margin, width - crop_margin, height - crop_margin)
-    img_cropped = img.crop(crop_box)
-
-    # Resize to target size
-    img_resized = img_cropped.resize((size, size), Image.Resampling.LANCZOS)
-
     # Add some padding for safe area (20% padding)
     padded_size = size
     padding = int(size * 0.1)  # 10% padding on each side
@@ -125,9 +180,9 @@ def create_square_icon(input_path, output_path, size):
     # Create a new image with padding
     output = Image.new('RGBA', (padded_size, padded_size), (0, 0, 0, 0))
 
-    # Calculate position to center the icon with padding
+    # Resize straight to the padded content size in a single LANCZOS pass
     paste_size = size - (padding * 2)
-    img_with_padding = img_resized.resize((paste_size, paste_size), Image.Resampling.LANCZOS)
+    img_with_padding = base_img.resize((paste_size, paste_size), Image.Resampling.LANCZOS)
 
     # Paste centered
     output.paste(img_with_padding, (padding, padding), img_with_padding)
@@ -167,38 +222,33 @@ def main():
         (512, 'icon-512.png'),
     ]
 
-    # Create square icons with slightly curved edges (for display)
-    print("\n📦 Creating display icons (square with slightly curved edges):")
-    for size, filename in icon_sizes:
-        output_path = os.path.join(static_dir, filename)
-        create_rounded_rectangle_mask_icon(input_image, output_path, size, corner_radius_percent=8)
+    # Square icons with slightly curved edges (for display)
+    tasks = [('rounded', input_image, os.path.join(static_dir, filename), size, 8)
+             for size, filename in icon_sizes]
 
-    # Create maskable icons (square with safe area padding)
-    print("\n📦 Creating maskable icons (for adaptive icons):")
+    # Maskable icons (square with safe area padding, for adaptive icons)
     maskable_sizes = [
         (192, 'icon-192-maskable.png'),
         (512, 'icon-512-maskable.png'),
     ]
+    tasks += [('maskable', input_image, os.path.join(static_dir, filename), size, None)
+              for size, filename in maskable_sizes]
 
-    for size, filename in maskable_sizes:
-        output_path = os.path.join(static_dir, filename)
-        create_square_icon(input_image, output_path, size)
-
-    # Create apple-touch-icon (180x180 for iOS)
-    print("\n🍎 Creating Apple Touch Icon:")
-    apple_icon_path = os.path.join(static_dir, 'apple-touch-icon.png')
-    create_rounded_rectangle_mask_icon(input_image, apple_icon_path, 180, corner_radius_percent=8)
+    # Apple Touch Icon (180x180 for iOS)
+    tasks.append(('rounded', input_image, os.path.join(static_dir, 'apple-touch-icon.png'), 180, 8))
 
-    # Create favicon sizes
-    print("\n🌐 Creating Favicons:")
+    # Favicons
     favicon_sizes = [
         (16, 'favicon-16x16.png'),
         (32, 'favicon-32x32.png'),
     ]
+    tasks += [('rounded', input_image, os.path.join(static_dir, filename), size, 8)
+              for size, filename in favicon_sizes]
 
-    for size, filename in favicon_sizes:
-        output_path = os.path.join(static_dir, filename)
-        create_rounded_rectangle_mask_icon(input_image, output_path, size, corner_radius_percent=8)
+    # Every icon is independent, so build them on all cores at once
+    print(f"\n📦 Creating {len(tasks)} icons in parallel:")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(_build_one_icon, tasks))
 
     print("\n✅ All icons created successfully!")
     print("\nNext steps:")
@@ -208,7 +258,18 @@ def main():
 
 def create_rounded_rectangle_mask_icon(input_path, output_path, size, corner_radius_percent):
     """Helper function that combines the logic"""
-    return create_pwa_icon(input_path, output_path, size, corner_radius_percent)
+    return create_pwa_icon(display_icon_base(input_path), output_path, size, corner_radius_percent)
+
+def _build_one_icon(task):
+    """Worker entry point for main(): build one icon from a picklable task tuple"""
+    kind, input_path, output_path, size, corner_radius_percent = task
+    # The source is decoded and cropped once per worker process (lru_cache)
+    if kind == 'maskable':
+        create_square_icon(maskable_icon_base(input_path), output_path, size)
+    else:
+        create_rounded_rectangle_mask_icon(input_path, output_path, size, corner_radius_percent)
+    # Don't ship the PIL image back to the parent process
+    return output_path
 
 if __name__ == '__main__':
     main()
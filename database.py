@@ -1,5 +1,16 @@
+import os
+import json
+import re
 from datetime import datetime
-from db_config import get_db_connection, get_db_type, release_db_connection
+from functools import lru_cache, wraps
+from db_config import get_db_connection, get_db_type, get_placeholder, release_db_connection
+from password_hashing import hash_password
+from detail_cache import cached_details, invalidate_details
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def get_auto_increment():
     """PostgreSQL auto-increment syntax"""
@@ -13,17 +24,21 @@ def get_insert_ignore():
     """PostgreSQL INSERT IGNORE syntax"""
     return 'ON CONFLICT DO NOTHING'
 
+# Stamped into schema_meta once init_db has run to completion. Bump it whenever
+# init_db gains a table, column, index or seed row so existing databases re-run it.
+SCHEMA_VERSION = 6
+
 def init_db():
     conn = get_db_connection()
     c = conn.cursor()
 
-    # For PostgreSQL, we need to commit after each schema change
-    # to avoid transaction errors with ALTER TABLE
+    # All schema work runs in one transaction, committed once at the end. No
+    # statement is expected to fail (columns are checked before ALTERing), so a
+    # failure rolls the whole initialization back instead of leaving it half done.
     def safe_execute(sql, description="SQL"):
         """Execute SQL and handle transaction errors"""
         try:
             c.execute(sql)
-            conn.commit()
             print(f"✅ {description}")
         except Exception as e:
             print(f"❌ ERROR in {description}: {e}")
@@ -32,206 +47,373 @@ def init_db():
             traceback.print_exc()
             raise  # Re-raise to stop initialization
 
+    def safe_execute_batch(statements, description="SQL batch"):
+        """Run several DDL statements in one round trip"""
+        try:
+            if _DB_TYPE == 'postgresql':
+                c.execute(';\n'.join(statements))
+            else:
+                # executescript would COMMIT first, so run them on the open transaction
+                for statement in statements:
+                    c.execute(statement)
+            print(f"✅ {description}")
+        except Exception as e:
+            print(f"❌ ERROR in {description}: {e}")
+            conn.rollback()
+            import traceback
+            traceback.print_exc()
+            raise
+
+    def seed_insert(table, columns, rows):
+        """Insert seed rows in one multi-row VALUES statement, skipping existing ones"""
+        # app.py only calls this init_db on SQLite; PostgreSQL uses database_postgres.init_db
+        row_placeholders = f"({', '.join(['?'] * len(rows[0]))})"
+        c.execute(f"INSERT OR IGNORE INTO {table} ({columns}) VALUES {', '.join([row_placeholders] * len(rows))}",
+                  [value for row in rows for value in row])
+
+    # Skip the whole DDL and seed pass when this schema version is already stamped
+    try:
+        c.execute("SELECT version FROM schema_meta")
+        stamped = c.fetchone()
+    except Exception:  # schema_meta not created yet
+        conn.rollback()
+        stamped = None
+    if stamped is not None and stamped[0] == SCHEMA_VERSION:
+        release_db_connection(conn)
+        print(f"✅ Database schema already at version {SCHEMA_VERSION}")
+        return
+    if _DB_TYPE == 'sqlite':
+        # sqlite3 only opens transactions implicitly for DML, so DDL would autocommit
+        c.execute('BEGIN')
+
     # Get database-specific syntax
     auto_inc = get_auto_increment()
     timestamp = get_timestamp_default()
-    insert_ignore = get_insert_ignore()
-
-    # Inspections table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS inspections
-                 (id {auto_inc},
-                  establishment_name TEXT,
-                  address TEXT,
-                  inspector_name TEXT,
-                  inspection_date TEXT,
-                  inspection_time TEXT,
-                  type_of_establishment TEXT,
-                  comments TEXT,
-                  inspector_signature TEXT,
-                  manager_signature TEXT,
-                  manager_date TEXT,
-                  created_at {timestamp},
-                  physical_location TEXT,
-                  owner TEXT,
-                  license_no TEXT,
-                  no_of_employees TEXT,
-                  purpose_of_visit TEXT,
-                  action TEXT,
-                  result TEXT,
-                  food_inspected TEXT,
-                  food_condemned TEXT,
-                  critical_score INTEGER,
-                  overall_score INTEGER,
-                  received_by TEXT,
-                  form_type TEXT,
-                  scores TEXT,
-                  inspector_code TEXT,
-                  photo_data TEXT)''')
-
-    # Inspection items table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS inspection_items
-                 (id {auto_inc},
-                  inspection_id INTEGER,
-                  item_id TEXT,
-                  details TEXT,
-                  obser TEXT,
-                  error TEXT,
-                  FOREIGN KEY (inspection_id) REFERENCES inspections(id))''')
-
-    # Burial site inspections table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS burial_site_inspections
-                 (id {auto_inc},
-                  inspection_date TEXT,
-                  applicant_name TEXT,
-                  deceased_name TEXT,
-                  burial_location TEXT,
-                  site_description TEXT,
-                  proximity_water_source TEXT,
-                  proximity_perimeter_boundaries TEXT,
-                  proximity_road_pathway TEXT,
-                  proximity_trees TEXT,
-                  proximity_houses_buildings TEXT,
-                  proposed_grave_type TEXT,
-                  general_remarks TEXT,
-                  inspector_signature TEXT,
-                  received_by TEXT,
-                  created_at {timestamp},
-                  photo_data TEXT)''')
-
-    # Residential inspections table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS residential_inspections
-                 (id {auto_inc},
-                  premises_name TEXT,
-                  owner TEXT,
-                  address TEXT,
-                  inspector_name TEXT,
-                  inspection_date TEXT,
-                  inspector_code TEXT,
-                  treatment_facility TEXT,
-                  vector TEXT,
-                  result TEXT,
-                  onsite_system TEXT,
-                  building_construction_type TEXT,
-                  purpose_of_visit TEXT,
-                  action TEXT,
-                  no_of_bedrooms TEXT,
-                  total_population TEXT,
-                  critical_score INTEGER,
-                  overall_score INTEGER,
-                  comments TEXT,
-                  inspector_signature TEXT,
-                  received_by TEXT,
-                  created_at {timestamp},
-                  photo_data TEXT)''')
-
-    # Residential checklist scores table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS residential_checklist_scores
-                 (id {auto_inc},
-                  form_id INTEGER,
-                  item_id INTEGER,
-                  score INTEGER,
-                  FOREIGN KEY (form_id) REFERENCES residential_inspections(id))''')
-
-    # Meat processing inspections table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS meat_processing_inspections
-                 (id {auto_inc},
-                  establishment_name TEXT,
-                  owner_operator TEXT,
-                  address TEXT,
-                  inspector_name TEXT,
-                  establishment_no TEXT,
-                  overall_score REAL,
-                  food_contact_surfaces INTEGER,
-                  water_samples INTEGER,
-                  product_samples INTEGER,
-                  types_of_products TEXT,
-                  staff_fhp INTEGER,
-                  staff_compliment INTEGER,
-                  water_public INTEGER,
-                  water_private INTEGER,
-                  type_processing INTEGER,
-                  type_slaughter INTEGER,
-                  purpose_of_visit TEXT,
-                  inspection_date TEXT,
-                  inspector_code TEXT,
-                  result TEXT,
-                  telephone_no TEXT,
-                  registration_status TEXT,
-                  action TEXT,
-                  comments TEXT,
-                  inspector_signature TEXT,
-                  received_by TEXT,
-                  created_at {timestamp},
-                  photo_data TEXT)''')
-
-    # Migration: Add staff_compliment column if it doesn't exist
-    try:
-        c.execute("ALTER TABLE meat_processing_inspections ADD COLUMN staff_compliment INTEGER")
-        conn.commit()
-        print("✓ Added staff_compliment column to meat_processing_inspections table")
-    except Exception as e:
-        # Column already exists or table doesn't exist yet - rollback and continue
-        conn.rollback()
-        pass
-
-    # Meat processing checklist scores table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS meat_processing_checklist_scores
-                 (id {auto_inc},
-                  form_id INTEGER,
-                  item_id INTEGER,
-                  score REAL,
-                  FOREIGN KEY (form_id) REFERENCES meat_processing_inspections(id))''')
-
-    # Threshold settings table (for alert system)
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS threshold_settings
-                 (chart_type TEXT NOT NULL,
-                  inspection_type TEXT NOT NULL,
-                  threshold_value REAL NOT NULL,
-                  enabled INTEGER DEFAULT 1,
-                  updated_at {timestamp},
-                  PRIMARY KEY (chart_type, inspection_type))''')
-
-    # Threshold alerts table (for low score notifications)
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS threshold_alerts
-                 (id {auto_inc},
-                  inspection_id INTEGER NOT NULL,
-                  inspector_name TEXT NOT NULL,
-                  form_type TEXT NOT NULL,
-                  score REAL NOT NULL,
-                  threshold_value REAL NOT NULL,
-                  created_at {timestamp})''')
-
-    # Users table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS users
-                 (id {auto_inc},
-                  username TEXT NOT NULL UNIQUE,
-                  password TEXT NOT NULL,
-                  role TEXT NOT NULL,
-                  email TEXT,
-                  parish TEXT,
-                  first_login INTEGER DEFAULT 1,
-                  is_flagged INTEGER DEFAULT 0)''')
-
-    # Migration: Add parish column if it doesn't exist
-    try:
-        c.execute("ALTER TABLE users ADD COLUMN parish TEXT")
-        conn.commit()
-        print("✓ Added parish column to users table")
-    except Exception:  # Catches both SQLite and PostgreSQL errors
-        # Column already exists
-        conn.rollback()
-        pass
 
-    # Migration: Add first_login column if it doesn't exist
-    try:
-        c.execute("ALTER TABLE users ADD COLUMN first_login INTEGER DEFAULT 1")
-        conn.commit()
-        print("✓ Added first_login column to users table")
-    except Exception as e:  # Catches both SQLite and PostgreSQL errors
-        # Column already exists or other error
-        conn.rollback()
-        if "duplicate column" not in str(e).lower() and "already exists" not in str(e).lower():
-            print(f"⚠️  Warning: Could not add first_login column: {e}")
+    # Every CREATE TABLE IF NOT EXISTS goes to the server as one batch
+    schema_statements = [
+        # Inspections table
+        f'''CREATE TABLE IF NOT EXISTS inspections
+                     (id {auto_inc},
+                      establishment_name TEXT,
+                      address TEXT,
+                      inspector_name TEXT,
+                      inspection_date TEXT,
+                      inspection_time TEXT,
+                      type_of_establishment TEXT,
+                      comments TEXT,
+                      inspector_signature TEXT,
+                      manager_signature TEXT,
+                      manager_date TEXT,
+                      created_at {timestamp},
+                      physical_location TEXT,
+                      owner TEXT,
+                      license_no TEXT,
+                      no_of_employees TEXT,
+                      purpose_of_visit TEXT,
+                      action TEXT,
+                      result TEXT,
+                      food_inspected TEXT,
+                      food_condemned TEXT,
+                      critical_score INTEGER,
+                      overall_score INTEGER,
+                      received_by TEXT,
+                      form_type TEXT,
+                      scores TEXT,
+                      inspector_code TEXT,
+                      photo_data TEXT)''',
+        # Inspection items table
+        f'''CREATE TABLE IF NOT EXISTS inspection_items
+                     (id {auto_inc},
+                      inspection_id INTEGER,
+                      item_id TEXT,
+                      details TEXT,
+                      obser TEXT,
+                      error TEXT,
+                      FOREIGN KEY (inspection_id) REFERENCES inspections(id))''',
+        # Burial site inspections table
+        f'''CREATE TABLE IF NOT EXISTS burial_site_inspections
+                     (id {auto_inc},
+                      inspection_date TEXT,
+                      applicant_name TEXT,
+                      deceased_name TEXT,
+                      burial_location TEXT,
+                      site_description TEXT,
+                      proximity_water_source TEXT,
+                      proximity_perimeter_boundaries TEXT,
+                      proximity_road_pathway TEXT,
+                      proximity_trees TEXT,
+                      proximity_houses_buildings TEXT,
+                      proposed_grave_type TEXT,
+                      general_remarks TEXT,
+                      inspector_signature TEXT,
+                      received_by TEXT,
+                      created_at {timestamp},
+                      photo_data TEXT)''',
+        # Residential inspections table
+        f'''CREATE TABLE IF NOT EXISTS residential_inspections
+                     (id {auto_inc},
+                      premises_name TEXT,
+                      owner TEXT,
+                      address TEXT,
+                      inspector_name TEXT,
+                      inspection_date TEXT,
+                      inspector_code TEXT,
+                      treatment_facility TEXT,
+                      vector TEXT,
+                      result TEXT,
+                      onsite_system TEXT,
+                      building_construction_type TEXT,
+                      purpose_of_visit TEXT,
+                      action TEXT,
+                      no_of_bedrooms TEXT,
+                      total_population TEXT,
+                      critical_score INTEGER,
+                      overall_score INTEGER,
+                      comments TEXT,
+                      inspector_signature TEXT,
+                      received_by TEXT,
+                      created_at {timestamp},
+                      photo_data TEXT)''',
+        # Residential checklist scores table
+        f'''CREATE TABLE IF NOT EXISTS residential_checklist_scores
+                     (id {auto_inc},
+                      form_id INTEGER,
+                      item_id INTEGER,
+                      score INTEGER,
+                      FOREIGN KEY (form_id) REFERENCES residential_inspections(id))''',
+        # Meat processing inspections table
+        f'''CREATE TABLE IF NOT EXISTS meat_processing_inspections
+                     (id {auto_inc},
+                      establishment_name TEXT,
+                      owner_operator TEXT,
+                      address TEXT,
+                      inspector_name TEXT,
+                      establishment_no TEXT,
+                      overall_score REAL,
+                      food_contact_surfaces INTEGER,
+                      water_samples INTEGER,
+                      product_samples INTEGER,
+                      types_of_products TEXT,
+                      staff_fhp INTEGER,
+                      staff_compliment INTEGER,
+                      water_public INTEGER,
+                      water_private INTEGER,
+                      type_processing INTEGER,
+                      type_slaughter INTEGER,
+                      purpose_of_visit TEXT,
+                      inspection_date TEXT,
+                      inspector_code TEXT,
+                      result TEXT,
+                      telephone_no TEXT,
+                      registration_status TEXT,
+                      action TEXT,
+                      comments TEXT,
+                      inspector_signature TEXT,
+                      received_by TEXT,
+                      created_at {timestamp},
+                      photo_data TEXT)''',
+        # Meat processing checklist scores table
+        f'''CREATE TABLE IF NOT EXISTS meat_processing_checklist_scores
+                     (id {auto_inc},
+                      form_id INTEGER,
+                      item_id INTEGER,
+                      score REAL,
+                      FOREIGN KEY (form_id) REFERENCES meat_processing_inspections(id))''',
+        # Threshold settings table (for alert system)
+        f'''CREATE TABLE IF NOT EXISTS threshold_settings
+                     (chart_type TEXT NOT NULL,
+                      inspection_type TEXT NOT NULL,
+                      threshold_value REAL NOT NULL,
+                      enabled INTEGER DEFAULT 1,
+                      updated_at {timestamp},
+                      PRIMARY KEY (chart_type, inspection_type))''',
+        # Threshold alerts table (for low score notifications)
+        f'''CREATE TABLE IF NOT EXISTS threshold_alerts
+                     (id {auto_inc},
+                      inspection_id INTEGER NOT NULL,
+                      inspector_name TEXT NOT NULL,
+                      form_type TEXT NOT NULL,
+                      score REAL NOT NULL,
+                      threshold_value REAL NOT NULL,
+                      created_at {timestamp})''',
+        # Users table
+        f'''CREATE TABLE IF NOT EXISTS users
+                     (id {auto_inc},
+                      username TEXT NOT NULL UNIQUE,
+                      password TEXT NOT NULL,
+                      role TEXT NOT NULL,
+                      email TEXT,
+                      parish TEXT,
+                      first_login INTEGER DEFAULT 1,
+                      is_flagged INTEGER DEFAULT 0)''',
+        # Login history table (required by login route)
+        f'''CREATE TABLE IF NOT EXISTS login_history
+                     (id {auto_inc},
+                      user_id INTEGER NOT NULL,
+                      username TEXT NOT NULL,
+                      email TEXT,
+                      role TEXT NOT NULL,
+                      login_time TEXT NOT NULL,
+                      ip_address TEXT,
+                      FOREIGN KEY (user_id) REFERENCES users(id))''',
+        # Contacts table
+        f'''CREATE TABLE IF NOT EXISTS contacts
+                     (user_id INTEGER,
+                      contact_id INTEGER,
+                      PRIMARY KEY (user_id, contact_id),
+                      FOREIGN KEY (user_id) REFERENCES users(id),
+                      FOREIGN KEY (contact_id) REFERENCES users(id))''',
+        # Messages table
+        f'''CREATE TABLE IF NOT EXISTS messages
+                     (id {auto_inc},
+                      sender_id INTEGER NOT NULL,
+                      receiver_id INTEGER NOT NULL,
+                      content TEXT NOT NULL,
+                      timestamp {timestamp},
+                      is_read INTEGER DEFAULT 0,
+                      FOREIGN KEY (sender_id) REFERENCES users(id),
+                      FOREIGN KEY (receiver_id) REFERENCES users(id))''',
+        # User sessions table for tracking active logins
+        f'''CREATE TABLE IF NOT EXISTS user_sessions
+                     (id {auto_inc},
+                      username TEXT NOT NULL,
+                      user_role VARCHAR(50),
+                      login_time TEXT NOT NULL,
+                      logout_time TEXT,
+                      last_activity TEXT,
+                      location_lat REAL,
+                      location_lng REAL,
+                      parish TEXT,
+                      ip_address TEXT,
+                      is_active INTEGER DEFAULT 1)''',
+        # Form templates table for dynamic form management
+        f'''CREATE TABLE IF NOT EXISTS form_templates
+                     (id {auto_inc},
+                      name TEXT NOT NULL UNIQUE,
+                      description TEXT,
+                      form_type TEXT NOT NULL,
+                      active INTEGER DEFAULT 1,
+                      created_date {timestamp},
+                      version TEXT DEFAULT '1.0',
+                      created_by TEXT,
+                      last_edited_by TEXT,
+                      last_edited_date TEXT,
+                      last_edited_role TEXT)''',
+        # Form items table for checklist items
+        f'''CREATE TABLE IF NOT EXISTS form_items
+                     (id {auto_inc},
+                      form_template_id INTEGER NOT NULL,
+                      item_order INTEGER NOT NULL,
+                      category TEXT NOT NULL,
+                      description TEXT NOT NULL,
+                      weight INTEGER NOT NULL,
+                      is_critical INTEGER DEFAULT 0,
+                      active INTEGER DEFAULT 1,
+                      created_date {timestamp},
+                      FOREIGN KEY (form_template_id) REFERENCES form_templates(id))''',
+        # Form categories table
+        f'''CREATE TABLE IF NOT EXISTS form_categories
+                     (id {auto_inc},
+                      name TEXT NOT NULL,
+                      description TEXT,
+                      display_order INTEGER DEFAULT 0)''',
+        # Form fields table for dynamic form fields
+        f'''CREATE TABLE IF NOT EXISTS form_fields
+                     (id {auto_inc},
+                      form_template_id INTEGER NOT NULL,
+                      field_name TEXT NOT NULL,
+                      field_label TEXT NOT NULL,
+                      field_type TEXT NOT NULL DEFAULT 'text',
+                      field_order INTEGER NOT NULL DEFAULT 0,
+                      required INTEGER DEFAULT 0,
+                      placeholder TEXT,
+                      default_value TEXT,
+                      options TEXT,
+                      field_group TEXT DEFAULT 'main',
+                      active INTEGER DEFAULT 1,
+                      created_date {timestamp},
+                      FOREIGN KEY (form_template_id) REFERENCES form_templates(id))''',
+        # Version of this schema last applied by init_db (single row)
+        'CREATE TABLE IF NOT EXISTS schema_meta (version INTEGER PRIMARY KEY)',
+    ]
+    safe_execute_batch(schema_statements, "Core tables")
+
+    # Columns added after the first release. The catalog is read once per table,
+    # so no ALTER is attempted (and rolled back) when the column already exists.
+    column_migrations = [
+        ('meat_processing_inspections', 'staff_compliment', 'INTEGER'),
+        ('users', 'parish', 'TEXT'),
+        ('users', 'first_login', 'INTEGER DEFAULT 1'),
+        ('messages', 'is_read', 'INTEGER DEFAULT 0'),
+        ('form_items', 'item_id', 'TEXT'),
+        # Detail getters select photo_data by name, so tables from before photos need it
+        ('inspections', 'photo_data', "TEXT DEFAULT '[]'"),
+        ('burial_site_inspections', 'photo_data', "TEXT DEFAULT '[]'"),
+        ('residential_inspections', 'photo_data', "TEXT DEFAULT '[]'"),
+        ('meat_processing_inspections', 'photo_data', "TEXT DEFAULT '[]'"),
+    ]
+    existing_columns = {table: _table_columns(c, table)
+                        for table in dict.fromkeys(table for table, _, _ in column_migrations)}
+    migrations = []
+    for table, column, column_def in column_migrations:
+        if column not in existing_columns[table]:
+            migrations.append(f"ALTER TABLE {table} ADD COLUMN {column} {column_def}")
+            print(f"✓ Adding {column} column to {table} table")
+            if (table, column) == ('messages', 'is_read'):
+                # Messages from before read tracking count as read. ADD COLUMN fills
+                # existing rows with the DEFAULT 0, so mark them all; this only runs
+                # alongside the ALTER, never on later startups
+                migrations.append("UPDATE messages SET is_read = 1")
+    if migrations:
+        safe_execute_batch(migrations, "Column migrations")
+
+    # Covering index for ordered checklist lookups per template (index-only scan).
+    # INCLUDE is PostgreSQL-only; SQLite gets the plain composite index.
+    include_cols = " INCLUDE (id, item_id, description, weight, is_critical, category)" if _DB_TYPE == 'postgresql' else ""
+    safe_execute(f'''CREATE INDEX IF NOT EXISTS idx_form_items_tpl_order
+                 ON form_items (form_template_id, item_order){include_cols}''',
+                 "Index idx_form_items_tpl_order")
+
+    # Lookup indexes: inspector history (filtered by inspector, newest first),
+    # form type filters (by id within a type), child rows by parent id and unread message counts
+    safe_execute_batch([
+        "CREATE INDEX IF NOT EXISTS idx_insp_inspector_date ON inspections (inspector_name, inspection_date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_res_inspector_date ON residential_inspections (inspector_name, inspection_date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_meat_inspector_date ON meat_processing_inspections (inspector_name, inspection_date DESC)",
+        # Same key as idx_*_inspector_date; only ever created on SQLite, where they could not cover anything
+        "DROP INDEX IF EXISTS idx_insp_inspector_cover",
+        "DROP INDEX IF EXISTS idx_res_inspector_cover",
+        "DROP INDEX IF EXISTS idx_meat_inspector_cover",
+        # (form_type, id) also serves form_type-only filters, so it replaces idx_inspections_form_type
+        "CREATE INDEX IF NOT EXISTS idx_inspections_form_type_id ON inspections (form_type, id)",
+        "DROP INDEX IF EXISTS idx_inspections_form_type",
+        # Leads with inspection_id, so it replaces idx_inspection_items_inspection
+        _SQL_CREATE_ITEMS_COVER,
+        "DROP INDEX IF EXISTS idx_inspection_items_inspection",
+        "CREATE INDEX IF NOT EXISTS idx_res_scores_form ON residential_checklist_scores (form_id)",
+        "CREATE INDEX IF NOT EXISTS idx_meat_scores_form ON meat_processing_checklist_scores (form_id)",
+        "CREATE INDEX IF NOT EXISTS idx_messages_receiver_read ON messages (receiver_id, is_read)",
+    ], "Lookup indexes")
+    if _DB_TYPE == 'sqlite':
+        # Every write to a listed table, from any process or any raw SQL in app.py,
+        # bumps list_version; cached list reads are keyed on it
+        safe_execute_batch([
+            "CREATE TABLE IF NOT EXISTS list_version (version INTEGER NOT NULL)",
+            "INSERT INTO list_version (version) SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM list_version)",
+        ] + [f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_list_version
+                 AFTER {event} ON {table}
+                 BEGIN UPDATE list_version SET version = version + 1; END'''
+             for table in _LIST_TABLES for event in ('INSERT', 'UPDATE', 'DELETE')],
+            "List version triggers")
+
+        # Seed planner stats once with a full ANALYZE; after that PRAGMA optimize
+        # (also run as pooled connections close) only re-analyzes what changed
+        c.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if c.fetchone() is None:
+            safe_execute("ANALYZE", "ANALYZE")
+        else:
+            safe_execute("PRAGMA optimize", "PRAGMA optimize")
 
     # Insert users
     users = [
@@ -243,129 +425,10 @@ def init_db():
         ('inspector6', 'Insp678!secure', 'inspector'),
         ('admin', 'Admin901!secure', 'admin')
     ]
-    # PostgreSQL only
-    c.executemany("INSERT INTO users (username, password, role) VALUES (%s, %s, %s) ON CONFLICT (username) DO NOTHING", users)
-
-    # Login history table (required by login route)
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS login_history
-                 (id {auto_inc},
-                  user_id INTEGER NOT NULL,
-                  username TEXT NOT NULL,
-                  email TEXT,
-                  role TEXT NOT NULL,
-                  login_time TEXT NOT NULL,
-                  ip_address TEXT,
-                  FOREIGN KEY (user_id) REFERENCES users(id))''')
-
-    # Contacts table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS contacts
-                 (user_id INTEGER,
-                  contact_id INTEGER,
-                  PRIMARY KEY (user_id, contact_id),
-                  FOREIGN KEY (user_id) REFERENCES users(id),
-                  FOREIGN KEY (contact_id) REFERENCES users(id))''')
-
-    # Messages table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS messages
-                 (id {auto_inc},
-                  sender_id INTEGER NOT NULL,
-                  receiver_id INTEGER NOT NULL,
-                  content TEXT NOT NULL,
-                  timestamp {timestamp},
-                  is_read INTEGER DEFAULT 0,
-                  FOREIGN KEY (sender_id) REFERENCES users(id),
-                  FOREIGN KEY (receiver_id) REFERENCES users(id))''')
-
-    # Add is_read column if it doesn't exist
-    try:
-        c.execute("ALTER TABLE messages ADD COLUMN is_read INTEGER DEFAULT 0")
-        conn.commit()
-    except Exception:  # Catches both SQLite and PostgreSQL errors
-        conn.rollback()
-        pass  # Column already exists
-
-    # Set existing messages as read
-    try:
-        c.execute("UPDATE messages SET is_read = 1 WHERE is_read IS NULL")
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        pass
-
-    # User sessions table for tracking active logins
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS user_sessions
-                 (id {auto_inc},
-                  username TEXT NOT NULL,
-                  user_role VARCHAR(50),
-                  login_time TEXT NOT NULL,
-                  logout_time TEXT,
-                  last_activity TEXT,
-                  location_lat REAL,
-                  location_lng REAL,
-                  parish TEXT,
-                  ip_address TEXT,
-                  is_active INTEGER DEFAULT 1)''')
-
-    # Form templates table for dynamic form management
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS form_templates
-                 (id {auto_inc},
-                  name TEXT NOT NULL UNIQUE,
-                  description TEXT,
-                  form_type TEXT NOT NULL,
-                  active INTEGER DEFAULT 1,
-                  created_date {timestamp},
-                  version TEXT DEFAULT '1.0',
-                  created_by TEXT,
-                  last_edited_by TEXT,
-                  last_edited_date TEXT,
-                  last_edited_role TEXT)''')
-
-    # Form items table for checklist items
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS form_items
-                 (id {auto_inc},
-                  form_template_id INTEGER NOT NULL,
-                  item_order INTEGER NOT NULL,
-                  category TEXT NOT NULL,
-                  description TEXT NOT NULL,
-                  weight INTEGER NOT NULL,
-                  is_critical INTEGER DEFAULT 0,
-                  active INTEGER DEFAULT 1,
-                  created_date {timestamp},
-                  FOREIGN KEY (form_template_id) REFERENCES form_templates(id))''')
-
-    # Migration: Add item_id column to form_items if it doesn't exist
-    try:
-        c.execute("ALTER TABLE form_items ADD COLUMN item_id TEXT")
-        conn.commit()
-        print("✓ Added item_id column to form_items table")
-    except Exception:
-        # Column already exists (catches both SQLite and PostgreSQL errors)
-        conn.rollback()
-        pass
-
-    # Form categories table
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS form_categories
-                 (id {auto_inc},
-                  name TEXT NOT NULL,
-                  description TEXT,
-                  display_order INTEGER DEFAULT 0)''')
-
-    # Form fields table for dynamic form fields
-    safe_execute(f'''CREATE TABLE IF NOT EXISTS form_fields
-                 (id {auto_inc},
-                  form_template_id INTEGER NOT NULL,
-                  field_name TEXT NOT NULL,
-                  field_label TEXT NOT NULL,
-                  field_type TEXT NOT NULL DEFAULT 'text',
-                  field_order INTEGER NOT NULL DEFAULT 0,
-                  required INTEGER DEFAULT 0,
-                  placeholder TEXT,
-                  default_value TEXT,
-                  options TEXT,
-                  field_group TEXT DEFAULT 'main',
-                  active INTEGER DEFAULT 1,
-                  created_date {timestamp},
-                  FOREIGN KEY (form_template_id) REFERENCES form_templates(id))''')
+    # Each seed goes in as one multi-row VALUES statement: a single round trip
+    # instead of one per row
+    seed_insert('users', 'username, password, role',
+                [(username, hash_password(password), role) for username, password, role in users])
 
     # Seed default form templates
     existing_templates = [
@@ -380,81 +443,244 @@ def init_db():
         ('Meat Processing Inspection', 'Meat processing plant and slaughter place inspection', 'Meat Processing')
     ]
 
-    # PostgreSQL only
-    for template in existing_templates:
-        c.execute('INSERT INTO form_templates (name, description, form_type) VALUES (%s, %s, %s) ON CONFLICT (name) DO NOTHING', template)
+    seed_insert('form_templates', 'name, description, form_type', existing_templates)
+
+    # Stamp the schema version so the next startup can skip all of the above
+    c.execute("DELETE FROM schema_meta")
+    c.execute(f"INSERT INTO schema_meta (version) VALUES ({SCHEMA_VERSION})")
 
-    # Final commit for all schema changes
+    # Single commit for all schema changes and seed rows
     conn.commit()
     release_db_connection(conn)
     print("✅ All database tables initialized successfully")
 
-def save_inspection(data):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
-    try:
-        c = conn.cursor()
-        query = f'''INSERT INTO inspections (establishment_name, address, inspector_name, inspection_date, inspection_time,
-                     type_of_establishment, no_of_employees, purpose_of_visit, action, result, food_inspected, food_condemned,
-                     critical_score, overall_score, comments, inspector_signature, received_by, form_type, scores, created_at,
-                     inspector_code, license_no, owner, photo_data)
-                     VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})'''
-        c.execute(query,
-                  (data['establishment_name'], data['address'], data['inspector_name'], data['inspection_date'],
-                   data['inspection_time'], data['type_of_establishment'], data['no_of_employees'],
-                   data['purpose_of_visit'], data['action'], data['result'], data['food_inspected'],
-                   data['food_condemned'], data['critical_score'], data['overall_score'], data['comments'],
-                   data['inspector_signature'], data['received_by'], data['form_type'], data['scores'],
-                   data['created_at'], data['inspector_code'], data['license_no'], data['owner'],
-                   data.get('photo_data', '[]')))
-        conn.commit()
-        if get_db_type() == 'postgresql':
-            c.execute('SELECT lastval()')
-            inspection_id = c.fetchone()[0]
+# Database type and placeholder, resolved once: DATABASE_URL does not change
+# after startup, so helpers on the request path reuse these instead of asking
+# db_config on every call.
+_DB_TYPE = get_db_type()
+
+# Statements used by the save/get helpers, built once so each call reuses the
+# same string (and the driver's cached statement) instead of formatting it again.
+_PH = get_placeholder()
+
+# Small hotel items are read as (item_id, obser, error) per inspection; cover
+# them so the lookup never touches the table (INCLUDE on PostgreSQL only)
+_SQL_CREATE_ITEMS_COVER = "CREATE INDEX IF NOT EXISTS idx_items_cover ON inspection_items " + (
+    "(inspection_id, item_id) INCLUDE (obser, error)" if _DB_TYPE == 'postgresql'
+    else "(inspection_id, item_id, obser, error)")
+
+def _column_fills(columns, defaults):
+    """Replacement value for an empty field in each column: '' unless a default is given."""
+    return tuple(defaults.get(name, '') for name in columns)
+
+# Columns returned by the *_details helpers, selected by name so the dicts do not
+# depend on table column order (ALTER-added columns land at the end)
+_INSPECTION_COLUMNS = (
+    'id', 'establishment_name', 'address', 'inspector_name', 'inspection_date', 'inspection_time',
+    'type_of_establishment', 'comments', 'inspector_signature', 'manager_signature', 'manager_date',
+    'created_at', 'physical_location', 'owner', 'license_no', 'no_of_employees', 'purpose_of_visit',
+    'action', 'result', 'food_inspected', 'food_condemned', 'critical_score', 'overall_score',
+    'received_by', 'form_type', 'scores', 'inspector_code', 'photo_data')
+_INSPECTION_SUMMARY_COLUMNS = tuple(
+    col for col in _INSPECTION_COLUMNS
+    if col not in ('photo_data', 'scores', 'inspector_signature', 'manager_signature'))
+_INSPECTION_DEFAULTS = {'critical_score': 0, 'overall_score': 0, 'photo_data': '[]'}
+_INSPECTION_FILLS = _column_fills(_INSPECTION_COLUMNS, _INSPECTION_DEFAULTS)
+_INSPECTION_SUMMARY_FILLS = _column_fills(_INSPECTION_SUMMARY_COLUMNS, _INSPECTION_DEFAULTS)
+
+_BURIAL_COLUMNS = (
+    'id', 'inspection_date', 'applicant_name', 'deceased_name', 'burial_location', 'site_description',
+    'proximity_water_source', 'proximity_perimeter_boundaries', 'proximity_road_pathway',
+    'proximity_trees', 'proximity_houses_buildings', 'proposed_grave_type', 'general_remarks',
+    'inspector_signature', 'received_by', 'created_at', 'photo_data')
+_BURIAL_FILLS = _column_fills(_BURIAL_COLUMNS, {'photo_data': '[]'})
+
+_RES_COLUMNS = (
+    'id', 'premises_name', 'owner', 'address', 'inspector_name', 'inspection_date', 'inspector_code',
+    'treatment_facility', 'vector', 'result', 'onsite_system', 'building_construction_type',
+    'purpose_of_visit', 'action', 'no_of_bedrooms', 'total_population', 'critical_score',
+    'overall_score', 'comments', 'inspector_signature', 'received_by', 'created_at', 'photo_data')
+_RES_FILLS = _column_fills(_RES_COLUMNS, {'critical_score': 0, 'overall_score': 0, 'photo_data': '[]'})
+
+_MEAT_COLUMNS = (
+    'id', 'establishment_name', 'owner_operator', 'address', 'inspector_name', 'establishment_no',
+    'overall_score', 'food_contact_surfaces', 'water_samples', 'product_samples', 'types_of_products',
+    'staff_fhp', 'staff_compliment', 'water_public', 'water_private', 'type_processing',
+    'type_slaughter', 'purpose_of_visit', 'inspection_date', 'inspector_code', 'result',
+    'telephone_no', 'registration_status', 'action', 'comments', 'inspector_signature',
+    'received_by', 'created_at', 'photo_data')
+_MEAT_FILLS = _column_fills(_MEAT_COLUMNS, {
+    'overall_score': 0.0, 'food_contact_surfaces': 0, 'water_samples': 0, 'product_samples': 0,
+    'staff_fhp': 0, 'staff_compliment': 0, 'water_public': 0, 'water_private': 0,
+    'type_processing': 0, 'type_slaughter': 0, 'photo_data': '[]'})
+
+# Writable columns per inspection kind, in statement order, and defaults for
+# optional keys. Columns without a default must be present in the submitted
+# data; created_at defaults to now and photo_data is stored as submitted.
+_SAVE_SPECS = {
+    'inspection': ('inspections', (
+        'establishment_name', 'address', 'inspector_name', 'inspection_date', 'inspection_time',
+        'type_of_establishment', 'no_of_employees', 'purpose_of_visit', 'action', 'result',
+        'food_inspected', 'food_condemned', 'critical_score', 'overall_score', 'comments',
+        'inspector_signature', 'received_by', 'form_type', 'scores', 'created_at',
+        'inspector_code', 'license_no', 'owner', 'photo_data'), {}),
+    'burial': ('burial_site_inspections', (
+        'inspection_date', 'applicant_name', 'deceased_name', 'burial_location', 'site_description',
+        'proximity_water_source', 'proximity_perimeter_boundaries', 'proximity_road_pathway',
+        'proximity_trees', 'proximity_houses_buildings', 'proposed_grave_type', 'general_remarks',
+        'inspector_signature', 'received_by', 'photo_data', 'created_at'), {}),
+    'residential': ('residential_inspections', (
+        'premises_name', 'owner', 'address', 'inspector_name', 'inspection_date', 'inspector_code',
+        'treatment_facility', 'vector', 'result', 'onsite_system', 'building_construction_type',
+        'purpose_of_visit', 'action', 'no_of_bedrooms', 'total_population', 'critical_score',
+        'overall_score', 'comments', 'inspector_signature', 'received_by', 'created_at', 'photo_data'),
+        {'no_of_bedrooms': '', 'total_population': '', 'critical_score': 0, 'overall_score': 0}),
+    'meat': ('meat_processing_inspections', (
+        'establishment_name', 'owner_operator', 'address', 'inspector_name', 'establishment_no',
+        'overall_score', 'food_contact_surfaces', 'water_samples', 'product_samples',
+        'types_of_products', 'staff_fhp', 'staff_compliment', 'water_public', 'water_private',
+        'type_processing', 'type_slaughter', 'purpose_of_visit', 'inspection_date', 'inspector_code',
+        'result', 'telephone_no', 'registration_status', 'action', 'comments', 'inspector_signature',
+        'received_by', 'created_at', 'photo_data'),
+        {'staff_compliment': 0}),
+}
+
+_SQL_INSERT = {
+    kind: f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([_PH] * len(columns))}) RETURNING id"
+    for kind, (table, columns, _) in _SAVE_SPECS.items()
+}
+
+_SQL_UPDATE = {
+    kind: f"UPDATE {table} SET {', '.join(f'{col} = {_PH}' for col in columns)} WHERE id = {_PH}"
+    for kind, (table, columns, _) in _SAVE_SPECS.items()
+}
+
+_SQL_SAVE = {'insert': _SQL_INSERT, 'update': _SQL_UPDATE}
+
+_SQL_GET_INSPECTIONS = "SELECT id, establishment_name, inspector_name, inspection_date, type_of_establishment, created_at, result FROM inspections"
+
+_SQL_GET_INSPECTIONS_BY_INSPECTOR_ALL = f"""SELECT id, establishment_name, inspector_name, inspection_date, type_of_establishment,
+           created_at, result, form_type
+    FROM inspections
+    WHERE inspector_name = {_PH}
+    UNION ALL
+    SELECT id, premises_name as establishment_name, inspector_name, inspection_date,
+           'Residential' as type_of_establishment, created_at, result, 'Residential' as form_type
+    FROM residential_inspections
+    WHERE inspector_name = {_PH}
+    UNION ALL
+    SELECT id, establishment_name, inspector_name, inspection_date,
+           'Meat Processing' as type_of_establishment, created_at, result, 'Meat Processing' as form_type
+    FROM meat_processing_inspections
+    WHERE inspector_name = {_PH}
+    UNION ALL
+    SELECT id, deceased_name as establishment_name, inspector_name, inspection_date,
+           'Burial' as type_of_establishment, created_at, 'Completed' as result, 'Burial' as form_type
+    FROM burial_site_inspections
+    WHERE inspector_name = {_PH}
+    ORDER BY created_at DESC"""
+
+_SQL_GET_INSPECTIONS_BY_INSPECTOR_TYPE = f"""SELECT id, establishment_name, inspector_name, inspection_date, type_of_establishment,
+    created_at, result, form_type FROM inspections
+    WHERE inspector_name = {_PH} AND (form_type = {_PH} OR type_of_establishment = {_PH})
+    ORDER BY inspection_date DESC"""
+
+_SQL_GET_RES_BY_INSPECTOR = f"""SELECT id, premises_name as establishment_name, inspector_name, inspection_date,
+    'Residential' as type_of_establishment, created_at, result, 'Residential' as form_type
+    FROM residential_inspections
+    WHERE inspector_name = {_PH} ORDER BY inspection_date DESC"""
+
+_SQL_GET_MEAT_BY_INSPECTOR = f"""SELECT id, establishment_name, inspector_name, inspection_date,
+    'Meat Processing' as type_of_establishment, created_at, result, 'Meat Processing' as form_type
+    FROM meat_processing_inspections
+    WHERE inspector_name = {_PH} ORDER BY inspection_date DESC"""
+
+_SQL_GET_BURIAL_BY_INSPECTOR = f"""SELECT id, deceased_name as establishment_name, inspector_name, inspection_date,
+    'Burial' as type_of_establishment, created_at, 'Completed' as result, 'Burial' as form_type
+    FROM burial_site_inspections
+    WHERE inspector_name = {_PH} ORDER BY inspection_date DESC"""
+
+_SQL_GET_BURIAL_INSPECTIONS = "SELECT id, applicant_name, deceased_name, created_at, 'Completed' AS status FROM burial_site_inspections"
+
+_SQL_GET_RES_INSPECTIONS = "SELECT id, premises_name, inspection_date, result FROM residential_inspections"
+
+_SQL_GET_MEAT_INSPECTIONS = "SELECT id, establishment_name, inspection_date, result FROM meat_processing_inspections"
+
+# Item scores come back as one JSON object column, so non-food forms need no
+# second round trip for inspection_items
+_JSON_OBJECT_AGG = 'json_object_agg' if _DB_TYPE == 'postgresql' else 'json_group_object'
+_JSON_ARRAY = 'json_build_array' if _DB_TYPE == 'postgresql' else 'json_array'
+_SQL_GET_INSPECTION = f"""SELECT {', '.join(_INSPECTION_COLUMNS)},
+           (SELECT CAST({_JSON_OBJECT_AGG}(item_id, details) AS TEXT) FROM inspection_items
+            WHERE inspection_id = i.id AND details IS NOT NULL AND details <> '') AS item_scores
+    FROM inspections i WHERE id = {_PH}"""
+
+_SQL_GET_INSPECTION_SUMMARY = f"SELECT {', '.join(_INSPECTION_SUMMARY_COLUMNS)} FROM inspections WHERE id = {_PH}"
+
+_SQL_GET_BURIAL = f"SELECT {', '.join(_BURIAL_COLUMNS)} FROM burial_site_inspections WHERE id = {_PH}"
+
+# Checklist scores come back with the inspection as one {item_id: score} JSON object
+_SQL_GET_RES = f"""SELECT {', '.join(_RES_COLUMNS)},
+           (SELECT CAST({_JSON_OBJECT_AGG}(item_id, score) AS TEXT)
+            FROM residential_checklist_scores WHERE form_id = r.id AND item_id IS NOT NULL) AS checklist_scores
+    FROM residential_inspections r WHERE id = {_PH}"""
+
+_SQL_GET_MEAT = f"""SELECT {', '.join(_MEAT_COLUMNS)},
+           (SELECT CAST({_JSON_OBJECT_AGG}(item_id, score) AS TEXT)
+            FROM meat_processing_checklist_scores WHERE form_id = m.id AND item_id IS NOT NULL) AS checklist_scores
+    FROM meat_processing_inspections m WHERE id = {_PH}"""
+
+# Items are aggregated per inspection rather than joined, so the wide
+# inspection row (photo_data included) is not repeated for every item
+_SQL_GET_SMALL_HOTEL = f"""SELECT {', '.join(_INSPECTION_COLUMNS)},
+           (SELECT CAST({_JSON_OBJECT_AGG}(item_id, {_JSON_ARRAY}(obser, error)) AS TEXT)
+            FROM inspection_items WHERE inspection_id = i.id AND item_id IS NOT NULL) AS item_scores
+    FROM inspections i WHERE id = {_PH} AND form_type = 'Small Hotel'"""
+
+_SQL_GET_SPIRIT_LICENCE = f"SELECT {', '.join(_INSPECTION_COLUMNS)} FROM inspections WHERE id = {_PH} AND form_type = 'Spirit Licence Premises'"
+
+def _last_insert_id(c):
+    """Id from the cursor's last INSERT ... RETURNING id."""
+    return c.fetchone()[0]
+
+def _record_params(kind, data, photo_json):
+    """Statement parameters for one kind of inspection, in _SAVE_SPECS column order."""
+    _, columns, defaults = _SAVE_SPECS[kind]
+    params = []
+    for col in columns:
+        if col == 'photo_data':
+            params.append(photo_json)
+        elif col == 'created_at':
+            params.append(data.get('created_at') or datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        elif col in defaults:
+            params.append(data.get(col, defaults[col]))
         else:
-            inspection_id = c.lastrowid
-        return inspection_id
-    except Exception as e:
-        conn.rollback()
-        print(f"Error saving inspection: {e}")
-        raise
-    finally:
-        release_db_connection(conn)
+            params.append(data[col])
+    return tuple(params)
+
+def _write_record(c, kind, data, allow_update=True):
+    """Insert (or update, when data has an id) one inspection; returns its id."""
+    params = _record_params(kind, data, data.get('photo_data', '[]'))
+    if allow_update and data.get('id'):
+        inspection_id = data['id']
+        c.execute(_SQL_SAVE['update'][kind], params + (inspection_id,))
+    else:
+        c.execute(_SQL_SAVE['insert'][kind], params)
+        inspection_id = _last_insert_id(c)
+    return inspection_id
 
-def save_burial_inspection(data):
-    from db_config import get_placeholder
-    ph = get_placeholder()
+def _save_record(kind, data, allow_update=True):
     conn = get_db_connection()
     try:
         c = conn.cursor()
-        if data.get('id'):
-            c.execute(f'''UPDATE burial_site_inspections SET
-                         inspection_date = {ph}, applicant_name = {ph}, deceased_name = {ph}, burial_location = {ph},
-                         site_description = {ph}, proximity_water_source = {ph}, proximity_perimeter_boundaries = {ph},
-                         proximity_road_pathway = {ph}, proximity_trees = {ph}, proximity_houses_buildings = {ph},
-                         proposed_grave_type = {ph}, general_remarks = {ph}, inspector_signature = {ph},
-                         received_by = {ph}, photo_data = {ph}, created_at = {ph}
-                         WHERE id = {ph}''',
-                      (data['inspection_date'], data['applicant_name'], data['deceased_name'], data['burial_location'],
-                       data['site_description'], data['proximity_water_source'], data['proximity_perimeter_boundaries'],
-                       data['proximity_road_pathway'], data['proximity_trees'], data['proximity_houses_buildings'],
-                       data['proposed_grave_type'], data['general_remarks'], data['inspector_signature'],
-                       data['received_by'], data.get('photo_data', '[]'),
-                       data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                       data['id']))
-        else:
-            c.execute(f'''INSERT INTO burial_site_inspections (inspection_date, applicant_name, deceased_name, burial_location,
-                        site_description, proximity_water_source, proximity_perimeter_boundaries, proximity_road_pathway,
-                        proximity_trees, proximity_houses_buildings, proposed_grave_type, general_remarks,
-                        inspector_signature, received_by, photo_data, created_at)
-                        VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})''',
-                      (data['inspection_date'], data['applicant_name'], data['deceased_name'], data['burial_location'],
-                       data['site_description'], data['proximity_water_source'], data['proximity_perimeter_boundaries'],
-                       data['proximity_road_pathway'], data['proximity_trees'], data['proximity_houses_buildings'],
-                       data['proposed_grave_type'], data['general_remarks'], data['inspector_signature'],
-                       data['received_by'], data.get('photo_data', '[]'), datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        if _DB_TYPE == 'sqlite':
+            # Take the write lock up front so a busy writer is waited on
+            # (busy_timeout) before any work is done
+            c.execute('BEGIN IMMEDIATE')
+        inspection_id = _write_record(c, kind, data, allow_update)
         conn.commit()
+        invalidate_details(kind, inspection_id)
+        return inspection_id
     except Exception as e:
         conn.rollback()
         print(f"Database error: {e}")
@@ -462,578 +688,342 @@ def save_burial_inspection(data):
     finally:
         release_db_connection(conn)
 
-def save_residential_inspection(data):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
-    try:
-        c = conn.cursor()
-        if data.get('id'):
-            c.execute(f"""
-                            UPDATE residential_inspections
-                            SET premises_name = {ph}, owner = {ph}, address = {ph}, inspector_name = {ph},
-                                inspection_date = {ph}, inspector_code = {ph}, treatment_facility = {ph}, vector = {ph},
-                                result = {ph}, onsite_system = {ph}, building_construction_type = {ph}, purpose_of_visit = {ph},
-                                action = {ph}, no_of_bedrooms = {ph}, total_population = {ph}, critical_score = {ph},
-                                overall_score = {ph}, comments = {ph}, inspector_signature = {ph}, received_by = {ph},
-                                created_at = {ph}, photo_data = {ph}
-                            WHERE id = {ph}
-                        """,
-                        (data['premises_name'], data['owner'], data['address'], data['inspector_name'],
-                         data['inspection_date'], data['inspector_code'], data['treatment_facility'], data['vector'],
-                         data['result'], data['onsite_system'], data['building_construction_type'], data['purpose_of_visit'],
-                         data['action'], data.get('no_of_bedrooms', ''), data.get('total_population', ''),
-                         data.get('critical_score', 0), data.get('overall_score', 0), data['comments'],
-                         data['inspector_signature'], data['received_by'],
-                         data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                         data.get('photo_data', '[]'), data['id']))
-        else:
-            c.execute(f"""
-                INSERT INTO residential_inspections (
-                    premises_name, owner, address, inspector_name,
-                    inspection_date, inspector_code, treatment_facility, vector, result, onsite_system,
-                    building_construction_type, purpose_of_visit, action, no_of_bedrooms, total_population,
-                    critical_score, overall_score, comments, inspector_signature, received_by, created_at, photo_data
-                )
-                VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-            """, (
-                data['premises_name'], data['owner'], data['address'], data['inspector_name'],
-                data['inspection_date'], data['inspector_code'], data['treatment_facility'], data['vector'],
-                data['result'], data['onsite_system'], data['building_construction_type'], data['purpose_of_visit'],
-                data['action'], data.get('no_of_bedrooms', ''), data.get('total_population', ''),
-                data.get('critical_score', 0), data.get('overall_score', 0), data['comments'],
-                data['inspector_signature'], data['received_by'],
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                data.get('photo_data', '[]')
-            ))
-        conn.commit()
+def save_inspection(data):
+    return _save_record('inspection', data, allow_update=False)
 
-        if data.get('id'):
-            inspection_id = data['id']
-        elif get_db_type() == 'postgresql':
-            c.execute('SELECT lastval()')
-            inspection_id = c.fetchone()[0]
-        else:
-            inspection_id = c.lastrowid
-        return inspection_id
-    except Exception as e:
-        conn.rollback()
-        print(f"Database error: {e}")
-        raise
-    finally:
-        release_db_connection(conn)
+def save_burial_inspection(data):
+    return _save_record('burial', data)
+
+def save_residential_inspection(data):
+    return _save_record('residential', data)
 
 def save_meat_processing_inspection(data):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
+    return _save_record('meat', data)
+
+# Tables read by the cached list queries; init_db gives each of them triggers
+# that bump list_version on every write
+_LIST_TABLES = ('inspections', 'burial_site_inspections', 'residential_inspections', 'meat_processing_inspections')
+
+def _db_version():
+    """Cache key that changes whenever a listed table is written, or None to skip caching."""
+    if _DB_TYPE != 'sqlite':
+        # PostgreSQL deployments use database_postgres, which does not cache lists
+        return None
+    conn = get_db_connection(readonly=True)
     try:
         c = conn.cursor()
-        if data.get('id'):
-            c.execute(f"""
-                UPDATE meat_processing_inspections
-                SET establishment_name = {ph}, owner_operator = {ph}, address = {ph}, inspector_name = {ph},
-                    establishment_no = {ph}, overall_score = {ph}, food_contact_surfaces = {ph}, water_samples = {ph},
-                    product_samples = {ph}, types_of_products = {ph}, staff_fhp = {ph}, staff_compliment = {ph}, water_public = {ph},
-                    water_private = {ph}, type_processing = {ph}, type_slaughter = {ph}, purpose_of_visit = {ph},
-                    inspection_date = {ph}, inspector_code = {ph}, result = {ph}, telephone_no = {ph},
-                    registration_status = {ph}, action = {ph}, comments = {ph}, inspector_signature = {ph},
-                    received_by = {ph}, created_at = {ph}, photo_data = {ph}
-                WHERE id = {ph}
-            """, (
-                data['establishment_name'], data['owner_operator'], data['address'], data['inspector_name'],
-                data['establishment_no'], data['overall_score'], data['food_contact_surfaces'], data['water_samples'],
-                data['product_samples'], data['types_of_products'], data['staff_fhp'], data.get('staff_compliment', 0), data['water_public'],
-                data['water_private'], data['type_processing'], data['type_slaughter'], data['purpose_of_visit'],
-                data['inspection_date'], data['inspector_code'], data['result'], data['telephone_no'],
-                data['registration_status'], data['action'], data['comments'], data['inspector_signature'],
-                data['received_by'], data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                data.get('photo_data', '[]'), data['id']
-            ))
-        else:
-            c.execute(f"""
-                INSERT INTO meat_processing_inspections (
-                    establishment_name, owner_operator, address, inspector_name,
-                    establishment_no, overall_score, food_contact_surfaces, water_samples,
-                    product_samples, types_of_products, staff_fhp, staff_compliment, water_public,
-                    water_private, type_processing, type_slaughter, purpose_of_visit,
-                    inspection_date, inspector_code, result, telephone_no,
-                    registration_status, action, comments, inspector_signature,
-                    received_by, created_at, photo_data
-                )
-                VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-            """, (
-                data['establishment_name'], data['owner_operator'], data['address'], data['inspector_name'],
-                data['establishment_no'], data['overall_score'], data['food_contact_surfaces'], data['water_samples'],
-                data['product_samples'], data['types_of_products'], data['staff_fhp'], data.get('staff_compliment', 0), data['water_public'],
-                data['water_private'], data['type_processing'], data['type_slaughter'], data['purpose_of_visit'],
-                data['inspection_date'], data['inspector_code'], data['result'], data['telephone_no'],
-                data['registration_status'], data['action'], data['comments'], data['inspector_signature'],
-                data['received_by'], datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                data.get('photo_data', '[]')
-            ))
-        conn.commit()
-
-        if data.get('id'):
-            inspection_id = data['id']
-        elif get_db_type() == 'postgresql':
-            c.execute('SELECT lastval()')
-            inspection_id = c.fetchone()[0]
-        else:
-            inspection_id = c.lastrowid
-        return inspection_id
-    except Exception as e:
-        conn.rollback()
-        print(f"Database error: {e}")
-        raise
+        c.execute("SELECT version FROM list_version")
+        row = c.fetchone()
+        return row[0] if row else None
+    except Exception:  # list_version not created yet (init_db has not run)
+        return None
     finally:
         release_db_connection(conn)
 
-def get_inspections():
-    conn = get_db_connection()
+def _run_query(sql, params=()):
+    conn = get_db_connection(readonly=True)
     try:
         c = conn.cursor()
-        c.execute("SELECT id, establishment_name, inspector_name, inspection_date, type_of_establishment, created_at, result FROM inspections")
-        inspections = c.fetchall()
-        return inspections
+        c.execute(sql, params)
+        return c.fetchall()
     finally:
         release_db_connection(conn)
 
-def get_inspections_by_inspector(inspector_name, inspection_type='all'):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
-    c = conn.cursor()
+@lru_cache(maxsize=16)
+def _cached_query(sql, params, version):
+    return tuple(_run_query(sql, params))
+
+def _query_rows(sql, params=()):
+    """Run a read query, reusing the last result while the database is unchanged."""
+    version = _db_version()
+    if version is None:
+        return _run_query(sql, params)
+    return list(_cached_query(sql, params, version))
+
+def _fetch_list(sql, limit=None, offset=0):
+    """
+    Run a list query. With a limit, only that page (newest id first) is read
+    from the database; without one the whole table is returned as before.
+    """
+    if limit is None:
+        return _query_rows(sql)
+    return _query_rows(f"{sql} ORDER BY id DESC LIMIT {_PH} OFFSET {_PH}", (limit, offset))
+
+def get_inspections(limit=None, offset=0):
+    return _fetch_list(_SQL_GET_INSPECTIONS, limit, offset)
 
+def get_inspections_by_inspector(inspector_name, inspection_type='all'):
     if inspection_type == 'all':
         # Get all inspection types for this inspector
-        c.execute(f"""
-            SELECT id, establishment_name, inspector_name, inspection_date, type_of_establishment,
-                   created_at, result, form_type
-            FROM inspections
-            WHERE inspector_name = {ph}
-            UNION
-            SELECT id, premises_name as establishment_name, inspector_name, inspection_date,
-                   'Residential' as type_of_establishment, created_at, result, 'Residential' as form_type
-            FROM residential_inspections
-            WHERE inspector_name = {ph}
-            UNION
-            SELECT id, establishment_name, inspector_name, inspection_date,
-                   'Meat Processing' as type_of_establishment, created_at, result, 'Meat Processing' as form_type
-            FROM meat_processing_inspections
-            WHERE inspector_name = {ph}
-            UNION
-            SELECT id, deceased_name as establishment_name, inspector_name, inspection_date,
-                   'Burial' as type_of_establishment, created_at, 'Completed' as result, 'Burial' as form_type
-            FROM burial_site_inspections
-            WHERE inspector_name = {ph}
-            ORDER BY created_at DESC
-        """, (inspector_name, inspector_name, inspector_name, inspector_name))
-    else:
-        # Filter by inspection type
-        if inspection_type == 'Residential':
-            c.execute(f"""SELECT id, premises_name as establishment_name, inspector_name, inspection_date,
-                         'Residential' as type_of_establishment, created_at, result, 'Residential' as form_type
-                         FROM residential_inspections
-                         WHERE inspector_name = {ph} ORDER BY inspection_date DESC""", (inspector_name,))
-        elif inspection_type == 'Meat Processing':
-            c.execute(f"""SELECT id, establishment_name, inspector_name, inspection_date,
-                         'Meat Processing' as type_of_establishment, created_at, result, 'Meat Processing' as form_type
-                         FROM meat_processing_inspections
-                         WHERE inspector_name = {ph} ORDER BY inspection_date DESC""", (inspector_name,))
-        elif inspection_type == 'Burial':
-            c.execute(f"""SELECT id, deceased_name as establishment_name, inspector_name, inspection_date,
-                         'Burial' as type_of_establishment, created_at, 'Completed' as result, 'Burial' as form_type
-                         FROM burial_site_inspections
-                         WHERE inspector_name = {ph} ORDER BY inspection_date DESC""", (inspector_name,))
-        else:
-            c.execute(f"""SELECT id, establishment_name, inspector_name, inspection_date, type_of_establishment,
-                         created_at, result, form_type FROM inspections
-                         WHERE inspector_name = {ph} AND (form_type = {ph} OR type_of_establishment = {ph})
-                         ORDER BY inspection_date DESC""", (inspector_name, inspection_type, inspection_type))
-
-    inspections = c.fetchall()
-    release_db_connection(conn)
-    return inspections
-
-def get_burial_inspections():
-    conn = get_db_connection()
+        return _query_rows(_SQL_GET_INSPECTIONS_BY_INSPECTOR_ALL, (inspector_name, inspector_name, inspector_name, inspector_name))
+    # Filter by inspection type
+    if inspection_type == 'Residential':
+        return _query_rows(_SQL_GET_RES_BY_INSPECTOR, (inspector_name,))
+    if inspection_type == 'Meat Processing':
+        return _query_rows(_SQL_GET_MEAT_BY_INSPECTOR, (inspector_name,))
+    if inspection_type == 'Burial':
+        return _query_rows(_SQL_GET_BURIAL_BY_INSPECTOR, (inspector_name,))
+    return _query_rows(_SQL_GET_INSPECTIONS_BY_INSPECTOR_TYPE, (inspector_name, inspection_type, inspection_type))
+
+def get_burial_inspections(limit=None, offset=0):
+    return _fetch_list(_SQL_GET_BURIAL_INSPECTIONS, limit, offset)
+
+def get_residential_inspections(limit=None, offset=0):
+    return _fetch_list(_SQL_GET_RES_INSPECTIONS, limit, offset)
+
+def get_meat_processing_inspections(limit=None, offset=0):
+    return _fetch_list(_SQL_GET_MEAT_INSPECTIONS, limit, offset)
+
+def _parse_scores_csv(scores_csv):
+    """Parse a comma-separated score string into a list of ints."""
+    if np is not None:
+        try:
+            scores = np.fromstring(scores_csv, sep=',', dtype=np.int64)
+        except ValueError:
+            scores = None
+        # A short result means numpy stopped at a value it could not parse
+        if scores is not None and scores.size == scores_csv.count(',') + 1:
+            return scores.tolist()
+    return [int(x) for x in scores_csv.split(',')]
+
+def _row_to_dict(row, columns, fills):
+    """Zip a row whose leading columns are `columns` into a dict, replacing empty values with `fills`."""
+    return {name: value or fill for name, value, fill in zip(columns, row, fills)}
+
+@cached_details('inspection')
+def get_inspection_details(inspection_id):
+    conn = get_db_connection(readonly=True)
     try:
         c = conn.cursor()
-        c.execute("SELECT id, applicant_name, deceased_name, created_at, 'Completed' AS status FROM burial_site_inspections")
-        inspections = c.fetchall()
-        return inspections
+        c.execute(_SQL_GET_INSPECTION, (inspection_id,))
+        inspection = c.fetchone()
+
+        if not inspection:
+            return None
+
+        inspection_dict = _row_to_dict(inspection, _INSPECTION_COLUMNS, _INSPECTION_FILLS)
+        if inspection['form_type'] == 'Food Establishment':
+            scores = _parse_scores_csv(inspection['scores']) if inspection['scores'] else [0] * 45
+            inspection_dict['scores'] = dict(zip(range(1, 46), scores))
+        else:
+            item_scores = json.loads(inspection['item_scores'] or '{}')
+            inspection_dict['scores'] = {int(item_id): details for item_id, details in item_scores.items()}
+        return inspection_dict
     finally:
         release_db_connection(conn)
 
-def get_residential_inspections():
-    conn = get_db_connection()
+@cached_details('inspection')
+def get_inspection_summary(inspection_id):
+    """Inspection header fields only - no photos, scores or signatures (for list views)."""
+    conn = get_db_connection(readonly=True)
     try:
         c = conn.cursor()
-        c.execute("SELECT id, premises_name, inspection_date, result FROM residential_inspections")
-        inspections = c.fetchall()
-        return inspections
+        c.execute(_SQL_GET_INSPECTION_SUMMARY, (inspection_id,))
+        inspection = c.fetchone()
+        if not inspection:
+            return None
+        return _row_to_dict(inspection, _INSPECTION_SUMMARY_COLUMNS, _INSPECTION_SUMMARY_FILLS)
     finally:
         release_db_connection(conn)
 
-def get_meat_processing_inspections():
-    conn = get_db_connection()
+@cached_details('burial')
+def get_burial_inspection_details(inspection_id):
+    conn = get_db_connection(readonly=True)
     try:
         c = conn.cursor()
-        c.execute("SELECT id, establishment_name, inspection_date, result FROM meat_processing_inspections")
-        inspections = c.fetchall()
-        return inspections
+        c.execute(_SQL_GET_BURIAL, (inspection_id,))
+        inspection = c.fetchone()
+        if not inspection:
+            return None
+        inspection_dict = _row_to_dict(inspection, _BURIAL_COLUMNS, _BURIAL_FILLS)
+        return inspection_dict
     finally:
         release_db_connection(conn)
 
-def get_inspection_details(inspection_id):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
+@cached_details('residential')
+def get_residential_inspection_details(inspection_id):
+    conn = get_db_connection(readonly=True)
     try:
         c = conn.cursor()
-        c.execute(f"SELECT * FROM inspections WHERE id = {ph}", (inspection_id,))
+        c.execute(_SQL_GET_RES, (inspection_id,))
         inspection = c.fetchone()
-
         if not inspection:
             return None
-
-        if inspection[24] == 'Food Establishment':
-            scores = [int(x) for x in inspection[25].split(',')] if inspection[25] else [0] * 45
-            inspection_dict = {
-                'id': inspection[0],
-                'establishment_name': inspection[1] or '',
-                'address': inspection[2] or '',
-                'inspector_name': inspection[3] or '',
-                'inspection_date': inspection[4] or '',
-                'inspection_time': inspection[5] or '',
-                'type_of_establishment': inspection[6] or '',
-                'comments': inspection[7] or '',
-                'inspector_signature': inspection[8] or '',
-                'manager_signature': inspection[9] or '',
-                'manager_date': inspection[10] or '',
-                'created_at': inspection[11] or '',
-                'physical_location': inspection[12] or '',
-                'owner': inspection[13] or '',
-                'license_no': inspection[14] or '',
-                'no_of_employees': inspection[15] or '',
-                'purpose_of_visit': inspection[16] or '',
-                'action': inspection[17] or '',
-                'result': inspection[18] or '',
-                'food_inspected': inspection[19] or '',
-                'food_condemned': inspection[20] or '',
-                'critical_score': inspection[21] or 0,
-                'overall_score': inspection[22] or 0,
-                'received_by': inspection[23] or '',
-                'form_type': inspection[24] or '',
-                'scores': dict(zip(range(1, 46), scores)),
-                'inspector_code': inspection[26] or '',
-                'photo_data': inspection[27] if len(inspection) > 27 else '[]'
-            }
-        else:
-            c.execute(f"SELECT item_id, details, obser, error FROM inspection_items WHERE inspection_id = {ph}", (inspection_id,))
-            items = c.fetchall()
-            scores = {int(item[0]): item[1] for item in items if item[1]}
-            inspection_dict = {
-                'id': inspection[0],
-                'establishment_name': inspection[1] or '',
-                'address': inspection[2] or '',
-                'inspector_name': inspection[3] or '',
-                'inspection_date': inspection[4] or '',
-                'inspection_time': inspection[5] or '',
-                'type_of_establishment': inspection[6] or '',
-                'comments': inspection[7] or '',
-                'inspector_signature': inspection[8] or '',
-                'manager_signature': inspection[9] or '',
-                'manager_date': inspection[10] or '',
-                'created_at': inspection[11] or '',
-                'physical_location': inspection[12] or '',
-                'owner': inspection[13] or '',
-                'license_no': inspection[14] or '',
-                'no_of_employees': inspection[15] or '',
-                'purpose_of_visit': inspection[16] or '',
-                'action': inspection[17] or '',
-                'result': inspection[18] or '',
-                'food_inspected': inspection[19] or '',
-                'food_condemned': inspection[20] or '',
-                'critical_score': inspection[21] or 0,
-                'overall_score': inspection[22] or 0,
-                'received_by': inspection[23] or '',
-                'form_type': inspection[24] or '',
-                'scores': scores,
-                'inspector_code': inspection[26] or '',
-                'photo_data': inspection[27] if len(inspection) > 27 else '[]'
-            }
-            return inspection_dict
+        scores = json.loads(inspection['checklist_scores'] or '{}')
+        checklist_scores = {int(item_id): score for item_id, score in scores.items()}
+        inspection_dict = _row_to_dict(inspection, _RES_COLUMNS, _RES_FILLS)
+        inspection_dict['checklist_scores'] = checklist_scores
+        return inspection_dict
     finally:
         release_db_connection(conn)
 
-def get_burial_inspection_details(inspection_id):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
+@cached_details('meat')
+def get_meat_processing_inspection_details(inspection_id):
+    conn = get_db_connection(readonly=True)
     try:
         c = conn.cursor()
-        c.execute(f"SELECT * FROM burial_site_inspections WHERE id = {ph}", (inspection_id,))
+        c.execute(_SQL_GET_MEAT, (inspection_id,))
         inspection = c.fetchone()
         if not inspection:
             return None
-        return {
-            'id': inspection[0],
-            'inspection_date': inspection[1] or '',
-            'applicant_name': inspection[2] or '',
-            'deceased_name': inspection[3] or '',
-            'burial_location': inspection[4] or '',
-            'site_description': inspection[5] or '',
-            'proximity_water_source': inspection[6] or '',
-            'proximity_perimeter_boundaries': inspection[7] or '',
-            'proximity_road_pathway': inspection[8] or '',
-            'proximity_trees': inspection[9] or '',
-            'proximity_houses_buildings': inspection[10] or '',
-            'proposed_grave_type': inspection[11] or '',
-            'general_remarks': inspection[12] or '',
-            'inspector_signature': inspection[13] or '',
-            'received_by': inspection[14] or '',
-            'created_at': inspection[15] or '',
-            'photo_data': inspection[16] if len(inspection) > 16 else '[]'
-        }
+        scores = json.loads(inspection['checklist_scores'] or '{}')
+        # Zero-padded string keys to match template expectations; score is a REAL column
+        checklist_scores = {item_id.zfill(2): score if score is None else float(score)
+                            for item_id, score in scores.items()}
+        inspection_dict = _row_to_dict(inspection, _MEAT_COLUMNS, _MEAT_FILLS)
+        inspection_dict['checklist_scores'] = checklist_scores
+        return inspection_dict
     finally:
         release_db_connection(conn)
 
-def get_residential_inspection_details(inspection_id):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
-    c = conn.cursor()
-    c.execute(f"SELECT * FROM residential_inspections WHERE id = {ph}", (inspection_id,))
-    inspection = c.fetchone()
-    if inspection:
-        c.execute(f"SELECT item_id, score FROM residential_checklist_scores WHERE form_id = {ph}", (inspection_id,))
-        checklist_scores = dict(c.fetchall())
-        release_db_connection(conn)
-        return {
-            'id': inspection[0],
-            'premises_name': inspection[1] or '',
-            'owner': inspection[2] or '',
-            'address': inspection[3] or '',
-            'inspector_name': inspection[4] or '',
-            'inspection_date': inspection[5] or '',
-            'inspector_code': inspection[6] or '',
-            'treatment_facility': inspection[7] or '',
-            'vector': inspection[8] or '',
-            'result': inspection[9] or '',
-            'onsite_system': inspection[10] or '',
-            'building_construction_type': inspection[11] or '',
-            'purpose_of_visit': inspection[12] or '',
-            'action': inspection[13] or '',
-            'no_of_bedrooms': inspection[14] or '',
-            'total_population': inspection[15] or '',
-            'critical_score': inspection[16] or 0,
-            'overall_score': inspection[17] or 0,
-            'comments': inspection[18] or '',
-            'inspector_signature': inspection[19] or '',
-            'received_by': inspection[20] or '',
-            'created_at': inspection[21] or '',
-            'photo_data': inspection[22] if len(inspection) > 22 else '[]',
-            'checklist_scores': checklist_scores
-        }
-    release_db_connection(conn)
-    return None
-
-def get_meat_processing_inspection_details(inspection_id):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
-    c = conn.cursor()
-    c.execute(f"SELECT * FROM meat_processing_inspections WHERE id = {ph}", (inspection_id,))
-    inspection = c.fetchone()
-    if inspection:
-        c.execute(f"SELECT item_id, score FROM meat_processing_checklist_scores WHERE form_id = {ph}", (inspection_id,))
-        # Convert integer keys to zero-padded string keys to match template expectations
-        checklist_scores = {str(item_id).zfill(2): score for item_id, score in c.fetchall()}
-        release_db_connection(conn)
-        return {
-            'id': inspection[0],
-            'establishment_name': inspection[1] or '',
-            'owner_operator': inspection[2] or '',
-            'address': inspection[3] or '',
-            'inspector_name': inspection[4] or '',
-            'establishment_no': inspection[5] or '',
-            'overall_score': inspection[6] or 0.0,
-            'food_contact_surfaces': inspection[7] or 0,
-            'water_samples': inspection[8] or 0,
-            'product_samples': inspection[9] or 0,
-            'types_of_products': inspection[10] or '',
-            'staff_fhp': inspection[11] or 0,
-            'staff_compliment': inspection[12] if len(inspection) > 12 else 0,
-            'water_public': inspection[13] if len(inspection) > 13 else 0,
-            'water_private': inspection[14] if len(inspection) > 14 else 0,
-            'type_processing': inspection[15] if len(inspection) > 15 else 0,
-            'type_slaughter': inspection[16] if len(inspection) > 16 else 0,
-            'purpose_of_visit': inspection[17] if len(inspection) > 17 else '',
-            'inspection_date': inspection[18] if len(inspection) > 18 else '',
-            'inspector_code': inspection[19] if len(inspection) > 19 else '',
-            'result': inspection[20] if len(inspection) > 20 else '',
-            'telephone_no': inspection[21] if len(inspection) > 21 else '',
-            'registration_status': inspection[22] if len(inspection) > 22 else '',
-            'action': inspection[23] if len(inspection) > 23 else '',
-            'comments': inspection[24] if len(inspection) > 24 else '',
-            'inspector_signature': inspection[25] if len(inspection) > 25 else '',
-            'received_by': inspection[26] if len(inspection) > 26 else '',
-            'created_at': inspection[27] if len(inspection) > 27 else '',
-            'photo_data': inspection[28] if len(inspection) > 28 else '[]',
-            'checklist_scores': checklist_scores
-        }
-    release_db_connection(conn)
-    return None
-
 
+@cached_details('inspection')
 def get_small_hotels_inspection_details(form_id):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    conn = get_db_connection(readonly=True)
+    try:
+        cursor = conn.cursor()
 
-    cursor.execute(f"SELECT * FROM inspections WHERE id = {ph} AND form_type = 'Small Hotel'", (form_id,))
-    inspection = cursor.fetchone()
+        cursor.execute(_SQL_GET_SMALL_HOTEL, (form_id,))
+        inspection = cursor.fetchone()
 
-    if not inspection:
-        release_db_connection(conn)
-        return None
-
-    inspection_dict = dict(inspection)
+        if not inspection:
+            return None
 
-    # Get individual scores
-    cursor.execute(f"SELECT item_id, obser, error FROM inspection_items WHERE inspection_id = {ph}", (form_id,))
-    items = cursor.fetchall()
+        inspection_dict = dict(inspection)
+    finally:
+        release_db_connection(conn)
 
+    # Individual scores arrive as {item_id: [obser, error]}
+    items = json.loads(inspection_dict.pop('item_scores') or '{}')
     obser_scores = {}
     error_scores = {}
-    for item in items:
-        obser_scores[item[0]] = item[1] or '0'
-        error_scores[item[0]] = item[2] or '0'
+    for item_id, (obser, error) in items.items():
+        obser_scores[item_id] = obser or '0'
+        error_scores[item_id] = error or '0'
 
     inspection_dict['obser'] = obser_scores
     inspection_dict['error'] = error_scores
 
-    release_db_connection(conn)
     return inspection_dict
 
 
+# Score keys "1", "2", ... built once; zipped against the split scores string
+_SCORE_KEYS = tuple(str(i) for i in range(1, 256))
+
+# One "<digits>: <text>" comment per line; both sides come back stripped
+_COMMENT_RE = re.compile(r'^[^\S\n]*(\d+)[^\S\n]*:[^\S\n]*(.*?)[^\S\n]*$', re.M)
+
+@cached_details('inspection')
 def get_spirit_licence_inspection_details(form_id):
-    from db_config import get_placeholder
-    ph = get_placeholder()
-    conn = get_db_connection()
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    conn = get_db_connection(readonly=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_GET_SPIRIT_LICENCE, (form_id,))
+        inspection = cursor.fetchone()
 
-    cursor.execute(f"SELECT * FROM inspections WHERE id = {ph} AND form_type = 'Spirit Licence Premises'", (form_id,))
-    inspection = cursor.fetchone()
+        if not inspection:
+            return None
 
-    if not inspection:
+        inspection_dict = dict(inspection)
+    finally:
         release_db_connection(conn)
-        return None
-
-    inspection_dict = dict(inspection)
 
     # Parse scores from the scores string
     scores_str = inspection_dict.get('scores', '')
-    if scores_str:
-        score_list = scores_str.split(',')
-        scores = {}
-        for i, score in enumerate(score_list, 1):
-            scores[str(i)] = score
-        inspection_dict['scores'] = scores
+    score_list = scores_str.split(',') if scores_str else []
+    if len(score_list) <= len(_SCORE_KEYS):
+        inspection_dict['scores'] = dict(zip(_SCORE_KEYS, score_list))
     else:
-        inspection_dict['scores'] = {}
-
-    # Parse comments into a dictionary for easier access
-    comments_str = inspection_dict.get('comments', '')
-    parsed_comments = {}
-    if comments_str:
-        comment_lines = comments_str.split('\n')
-        for line in comment_lines:
-            if ':' in line:
-                parts = line.split(':', 1)
-                if len(parts) == 2 and parts[0].strip().isdigit():
-                    parsed_comments[parts[0].strip()] = parts[1].strip()
+        inspection_dict['scores'] = {str(i): score for i, score in enumerate(score_list, 1)}
+
+    # Parse "<item>: <comment>" lines into a dictionary for easier access
+    parsed_comments = dict(_COMMENT_RE.findall(inspection_dict.get('comments') or ''))
     inspection_dict['parsed_comments'] = parsed_comments
 
-    release_db_connection(conn)
     return inspection_dict
 
+def _table_columns(c, table_name):
+    """Set of column names on a table (works with both SQLite and PostgreSQL)"""
+    if _DB_TYPE == 'postgresql':
+        c.execute("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = %s AND table_schema = 'public'
+        """, (table_name,))
+        return {row[0] for row in c.fetchall()}
+    c.execute(f"PRAGMA table_info({table_name})")
+    return {row[1] for row in c.fetchall()}
+
+# Ids of app.SWIMMING_POOL_CHECKLIST_ITEMS; the swimming pool form keeps one
+# score_<id> column per item on inspections
+_SWIMMING_POOL_ITEM_IDS = (
+    '1A', '1B', '1C', '1D', '1E', '1F', '1G', '1H',
+    '2A', '2B', '2C', '2D', '2E', '2F', '2G', '2H', '2I', '2J',
+    '3A', '3B', '3C', '3D', '4A', '4B', '5A', '5B', '6A', '6B', '6C', '6D',
+    '7A', '7B', '7C', '7D', '7E', '8A', '8B', '8C', '9A', '9B', '9C')
+
 def update_database_schema():
     """Update database schema to handle all form types properly"""
     conn = get_db_connection()
     c = conn.cursor()
-
-    # Add missing columns with error handling
-    columns_to_add = [
-        ('no_with_fhc', 'INTEGER DEFAULT 0'),
-        ('no_wo_fhc', 'INTEGER DEFAULT 0'),
-        ('status', 'TEXT'),
-        ('manager_signature', 'TEXT'),
-        ('manager_date', 'TEXT'),
-        ('parish', 'TEXT'),
-        ('physical_location', 'TEXT')
-    ]
-
-    for column_name, column_def in columns_to_add:
-        try:
-            c.execute(f"ALTER TABLE inspections ADD COLUMN {column_name} {column_def}")
-            print(f"Added column: {column_name}")
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" not in str(e):
-                print(f"Error adding {column_name}: {e}")
-            # Column already exists, continue
-
-    # Add missing columns for residential_inspections
     try:
-        c.execute("ALTER TABLE residential_inspections ADD COLUMN parish TEXT")
-    except Exception:  # Catches both SQLite and PostgreSQL errors
-        pass
-
-    # Add signature date columns to inspections table
-    signature_date_columns = [
-        'inspector_signature_date',
-        'manager_signature_date',
-        'received_by_date'
-    ]
-    for column in signature_date_columns:
-        try:
-            c.execute(f"ALTER TABLE inspections ADD COLUMN {column} TEXT")
-            print(f"✓ Added {column} column to inspections table")
-        except Exception:  # Catches both SQLite and PostgreSQL errors
-            pass
-
-    # Add missing swimming pool score columns
-    for item in SWIMMING_POOL_CHECKLIST_ITEMS:
-        try:
-            c.execute(f'ALTER TABLE inspections ADD COLUMN score_{item["id"]} REAL DEFAULT 0')
-        except Exception:  # Catches both SQLite and PostgreSQL errors
-            pass
-
-    # Create indexes for better performance
-    indexes = [
-        "CREATE INDEX IF NOT EXISTS idx_inspections_form_type ON inspections(form_type)",
-        "CREATE INDEX IF NOT EXISTS idx_inspections_date ON inspections(inspection_date)",
-        "CREATE INDEX IF NOT EXISTS idx_inspections_inspector ON inspections(inspector_name)",
-        "CREATE INDEX IF NOT EXISTS idx_inspections_created_at ON inspections(created_at)",
-        "CREATE INDEX IF NOT EXISTS idx_inspections_result ON inspections(result)",
-        "CREATE INDEX IF NOT EXISTS idx_residential_result ON residential_inspections(result)",
-        "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)",
-        "CREATE INDEX IF NOT EXISTS idx_login_history_user ON login_history(user_id)"
-    ]
-
-    for index in indexes:
-        try:
-            c.execute(index)
-        except Exception:  # Catches both SQLite and PostgreSQL errors
-            pass
-
-    conn.commit()
-    release_db_connection(conn)
+        # Read each table's columns once and only ALTER what is actually missing
+        inspection_columns = _table_columns(c, 'inspections')
+        residential_columns = _table_columns(c, 'residential_inspections')
+
+        columns_to_add = [
+            ('no_with_fhc', 'INTEGER DEFAULT 0'),
+            ('no_wo_fhc', 'INTEGER DEFAULT 0'),
+            ('status', 'TEXT'),
+            ('manager_signature', 'TEXT'),
+            ('manager_date', 'TEXT'),
+            ('parish', 'TEXT'),
+            ('physical_location', 'TEXT'),
+            # Detail getters select photo_data by name, so older tables need it too
+            ('photo_data', "TEXT DEFAULT '[]'"),
+            # Signature date columns
+            ('inspector_signature_date', 'TEXT'),
+            ('manager_signature_date', 'TEXT'),
+            ('received_by_date', 'TEXT')
+        ]
+        # Swimming pool score columns
+        columns_to_add += [(f'score_{item_id}', 'REAL DEFAULT 0') for item_id in _SWIMMING_POOL_ITEM_IDS]
+
+        missing = [('inspections', name, ddl)
+                   for name, ddl in columns_to_add if name not in inspection_columns]
+        if 'parish' not in residential_columns:
+            missing.append(('residential_inspections', 'parish', 'TEXT'))
+
+        statements = []
+        for table, name, ddl in missing:
+            statements.append(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+            print(f"Added column: {table}.{name}")
+
+        # Create indexes for better performance
+        statements += [
+            "CREATE INDEX IF NOT EXISTS idx_inspections_form_type_id ON inspections(form_type, id)",
+            "DROP INDEX IF EXISTS idx_inspections_form_type",
+            "CREATE INDEX IF NOT EXISTS idx_inspections_date ON inspections(inspection_date)",
+            "CREATE INDEX IF NOT EXISTS idx_inspections_inspector ON inspections(inspector_name)",
+            "CREATE INDEX IF NOT EXISTS idx_inspections_created_at ON inspections(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_inspections_result ON inspections(result)",
+            "CREATE INDEX IF NOT EXISTS idx_residential_result ON residential_inspections(result)",
+            "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)",
+            "CREATE INDEX IF NOT EXISTS idx_login_history_user ON login_history(user_id)",
+            _SQL_CREATE_ITEMS_COVER
+        ]
+
+        # One round trip, one transaction
+        if _DB_TYPE == 'postgresql':
+            c.execute(';\n'.join(statements))
+            conn.commit()
+        else:
+            conn.executescript('BEGIN;\n' + ';\n'.join(statements) + ';\nCOMMIT;')
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error updating database schema: {e}")
+    finally:
+        release_db_connection(conn)
 
 if __name__ == "__main__":
     init_db()
\ No newline at end of file
@@ -2,11 +2,83 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
 import os
+import re
+import weakref
 from dotenv import load_dotenv
 from db_config import get_db_connection, release_db_connection
+from detail_cache import cached_details, invalidate_details
 
 load_dotenv()
 
+# Save statements, PREPAREd once per pooled connection by _execute_prepared so
+# the server parses and plans each one only once
+_SQL_SAVE = {
+    'save_inspection_insert': '''INSERT INTO inspections (establishment_name, address, inspector_name, inspection_date,
+        inspection_time, type_of_establishment, no_of_employees, purpose_of_visit, action, result,
+        food_inspected, food_condemned, critical_score, overall_score, comments,
+        inspector_signature, received_by, form_type, scores, created_at, inspector_code,
+        license_no, owner, photo_data)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
+    'save_burial_insert': '''INSERT INTO burial_site_inspections (inspection_date, applicant_name, deceased_name,
+        burial_location, site_description, proximity_water_source, proximity_perimeter_boundaries,
+        proximity_road_pathway, proximity_trees, proximity_houses_buildings, proposed_grave_type,
+        general_remarks, inspector_signature, inspector_name, received_by, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)''',
+    'save_burial_update': '''UPDATE burial_site_inspections
+        SET inspection_date = %s, applicant_name = %s, deceased_name = %s, burial_location = %s,
+        site_description = %s, proximity_water_source = %s, proximity_perimeter_boundaries = %s,
+        proximity_road_pathway = %s, proximity_trees = %s, proximity_houses_buildings = %s,
+        proposed_grave_type = %s, general_remarks = %s, inspector_signature = %s,
+        inspector_name = %s, received_by = %s, created_at = %s
+        WHERE id = %s''',
+    'save_residential_insert': '''INSERT INTO residential_inspections (premises_name, owner, address, inspector_name,
+        inspection_date, inspector_code, treatment_facility, vector, result, onsite_system,
+        building_construction_type, purpose_of_visit, action, no_of_bedrooms, total_population,
+        critical_score, overall_score, comments, inspector_signature, received_by, photo_data,
+        created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
+    'save_residential_update': '''UPDATE residential_inspections
+        SET premises_name = %s, owner = %s, address = %s, inspector_name = %s,
+        inspection_date = %s, inspector_code = %s, treatment_facility = %s, vector = %s,
+        result = %s, onsite_system = %s, building_construction_type = %s, purpose_of_visit = %s,
+        action = %s, no_of_bedrooms = %s, total_population = %s, critical_score = %s,
+        overall_score = %s, comments = %s, inspector_signature = %s, received_by = %s,
+        photo_data = %s, created_at = %s
+        WHERE id = %s''',
+    'save_meat_insert': '''INSERT INTO meat_processing_inspections (establishment_name, owner_operator, address,
+        inspector_name, establishment_no, overall_score, critical_score, food_contact_surfaces,
+        water_samples, product_samples, types_of_products, staff_fhp, staff_compliment,
+        water_public, water_private, type_processing, type_slaughter, purpose_of_visit,
+        inspection_date, inspector_code, result, telephone_no, registration_status, action,
+        comments, inspector_signature, received_by, created_at, photo_data)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id''',
+    'save_meat_update': '''UPDATE meat_processing_inspections
+        SET establishment_name = %s, owner_operator = %s, address = %s, inspector_name = %s,
+        establishment_no = %s, overall_score = %s, critical_score = %s, food_contact_surfaces = %s,
+        water_samples = %s, product_samples = %s, types_of_products = %s, staff_fhp = %s,
+        staff_compliment = %s, water_public = %s, water_private = %s, type_processing = %s,
+        type_slaughter = %s, purpose_of_visit = %s, inspection_date = %s, inspector_code = %s,
+        result = %s, telephone_no = %s, registration_status = %s, action = %s, comments = %s,
+        inspector_signature = %s, received_by = %s, created_at = %s, photo_data = %s
+        WHERE id = %s''',
+}
+
+# Names of the statements already PREPAREd on each connection; entries go away
+# with the connection
+_PREPARED = weakref.WeakKeyDictionary()
+
+
+def _execute_prepared(cursor, name, params):
+    """Run a _SQL_SAVE statement through PREPARE (first use on this connection) and EXECUTE"""
+    prepared = _PREPARED.setdefault(cursor.connection, set())
+    if name not in prepared:
+        sql = _SQL_SAVE[name]
+        numbers = iter(range(1, sql.count('%s') + 1))
+        cursor.execute(f"PREPARE {name} AS {re.sub('%s', lambda _: f'${next(numbers)}', sql)}")
+        prepared.add(name)
+    cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+
 # Alias for compatibility with existing code
 def get_connection():
     """Get PostgreSQL database connection - uses db_config for proper Render support"""
@@ -38,12 +110,7 @@ def save_inspection(data):
     critical_score = data.get('critical_score') or None
     overall_score = data.get('overall_score') or None
 
-    cursor.execute('''INSERT INTO inspections (establishment_name, address, inspector_name, inspection_date, inspection_time,
-                 type_of_establishment, no_of_employees, purpose_of_visit, action, result, food_inspected, food_condemned,
-                 critical_score, overall_score, comments, inspector_signature, received_by, form_type, scores, created_at,
-                 inspector_code, license_no, owner, photo_data)
-                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                 RETURNING id''',
+    _execute_prepared(cursor, 'save_inspection_insert',
               (data['establishment_name'], data['address'], data['inspector_name'], data['inspection_date'],
                inspection_time, data['type_of_establishment'], no_of_employees,
                data['purpose_of_visit'], data['action'], data['result'], data['food_inspected'],
@@ -64,13 +131,7 @@ def save_burial_inspection(data):
     cursor = conn.cursor()
     try:
         if data.get('id'):
-            cursor.execute('''UPDATE burial_site_inspections SET
-                         inspection_date = %s, applicant_name = %s, deceased_name = %s, burial_location = %s,
-                         site_description = %s, proximity_water_source = %s, proximity_perimeter_boundaries = %s,
-                         proximity_road_pathway = %s, proximity_trees = %s, proximity_houses_buildings = %s,
-                         proposed_grave_type = %s, general_remarks = %s, inspector_signature = %s,
-                         inspector_name = %s, received_by = %s, created_at = %s
-                         WHERE id = %s''',
+            _execute_prepared(cursor, 'save_burial_update',
                       (data['inspection_date'], data['applicant_name'], data['deceased_name'], data['burial_location'],
                        data['site_description'], data['proximity_water_source'], data['proximity_perimeter_boundaries'],
                        data['proximity_road_pathway'], data['proximity_trees'], data['proximity_houses_buildings'],
@@ -78,17 +139,15 @@ def save_burial_inspection(data):
                        data.get('inspector_name', ''), data['received_by'],
                        data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S')), data['id']))
         else:
-            cursor.execute('''INSERT INTO burial_site_inspections (inspection_date, applicant_name, deceased_name, burial_location,
-                        site_description, proximity_water_source, proximity_perimeter_boundaries, proximity_road_pathway,
-                        proximity_trees, proximity_houses_buildings, proposed_grave_type, general_remarks,
-                        inspector_signature, inspector_name, received_by, created_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)''',
+            _execute_prepared(cursor, 'save_burial_insert',
                       (data['inspection_date'], data['applicant_name'], data['deceased_name'], data['burial_location'],
                        data['site_description'], data['proximity_water_source'], data['proximity_perimeter_boundaries'],
                        data['proximity_road_pathway'], data['proximity_trees'], data['proximity_houses_buildings'],
                        data['proposed_grave_type'], data['general_remarks'], data['inspector_signature'],
                        data.get('inspector_name', ''), data['received_by'], datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
         conn.commit()
+        if data.get('id'):
+            invalidate_details('burial', data['id'])
     except Exception as e:
         print(f"Database error: {e}")
         conn.rollback()
@@ -106,16 +165,7 @@ def save_residential_inspection(data):
     inspection_id = None
     try:
         if data.get('id'):
-            cursor.execute("""
-                            UPDATE residential_inspections
-                            SET premises_name = %s, owner = %s, address = %s, inspector_name = %s,
-                                inspection_date = %s, inspector_code = %s, treatment_facility = %s, vector = %s,
-                                result = %s, onsite_system = %s, building_construction_type = %s, purpose_of_visit = %s,
-                                action = %s, no_of_bedrooms = %s, total_population = %s, critical_score = %s,
-                                overall_score = %s, comments = %s, inspector_signature = %s, received_by = %s,
-                                photo_data = %s, created_at = %s
-                            WHERE id = %s
-                        """,
+            _execute_prepared(cursor, 'save_residential_update',
                         (data['premises_name'], data['owner'], data['address'], data['inspector_name'],
                          data['inspection_date'], data['inspector_code'], data['treatment_facility'], data['vector'],
                          data['result'], data['onsite_system'], data['building_construction_type'], data['purpose_of_visit'],
@@ -125,16 +175,7 @@ def save_residential_inspection(data):
                          data.get('created_at', datetime.now().strftime('%Y-%m-%d %H:%M:%S')), data['id']))
             inspection_id = data['id']
         else:
-            cursor.execute("""
-                INSERT INTO residential_inspections (
-                    premises_name, owner, address, inspector_name,
-                    inspection_date, inspector_code, treatment_facility, vector, result, onsite_system,
-                    building_construction_type, purpose_of_visit, action, no_of_bedrooms, total_population,
-                    critical_score, overall_score, comments, inspector_signature, received_by, photo_data, created_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
+            _execute_prepared(cursor, 'save_residential_insert', (
                 data['premises_name'], data['owner'], data['address'], data['inspector_name'],
                 data['inspection_date'], data['inspector_code'], data['treatment_facility'], data['vector'],
                 data['result'], data['onsite_system'], data['building_construction_type'], data['purpose_of_visit'],
@@ -145,6 +186,7 @@ def save_residential_inspection(data):
             ))
             inspection_id = cursor.fetchone()[0]
         conn.commit()
+        invalidate_details('residential', inspection_id)
     except Exception as e:
         print(f"Database error: {e}")
         conn.rollback()
@@ -292,6 +334,7 @@ def get_residential_inspections():
     release_db_connection(conn)
     return inspections
 
+@cached_details('inspection')
 def get_inspection_details(inspection_id):
     """Get detailed inspection information"""
     conn = get_connection()
@@ -371,6 +414,7 @@ def get_inspection_details(inspection_id):
     release_db_connection(conn)
     return None
 
+@cached_details('burial')
 def get_burial_inspection_details(inspection_id):
     """Get burial inspection details"""
     conn = get_connection()
@@ -401,6 +445,7 @@ def get_burial_inspection_details(inspection_id):
         }
     return None
 
+@cached_details('residential')
 def get_residential_inspection_details(inspection_id):
     """Get residential inspection details"""
     conn = get_connection()
@@ -442,6 +487,7 @@ def get_residential_inspection_details(inspection_id):
     release_db_connection(conn)
     return None
 
+@cached_details('inspection')
 def get_small_hotels_inspection_details(form_id):
     """Get small hotels inspection details"""
     conn = get_connection()
@@ -474,6 +520,7 @@ def get_small_hotels_inspection_details(form_id):
     release_db_connection(conn)
     return inspection_dict
 
+@cached_details('inspection')
 def get_spirit_licence_inspection_details(form_id):
     """Get spirit licence inspection details"""
     conn = get_connection()
@@ -522,17 +569,7 @@ def save_meat_processing_inspection(data):
     try:
         if data.get('id'):
             logging.info(f"📸 DB DEBUG - Updating existing inspection {data['id']}")
-            cursor.execute("""
-                UPDATE meat_processing_inspections
-                SET establishment_name = %s, owner_operator = %s, address = %s, inspector_name = %s,
-                    establishment_no = %s, overall_score = %s, critical_score = %s, food_contact_surfaces = %s, water_samples = %s,
-                    product_samples = %s, types_of_products = %s, staff_fhp = %s, staff_compliment = %s, water_public = %s,
-                    water_private = %s, type_processing = %s, type_slaughter = %s, purpose_of_visit = %s,
-                    inspection_date = %s, inspector_code = %s, result = %s, telephone_no = %s,
-                    registration_status = %s, action = %s, comments = %s, inspector_signature = %s,
-                    received_by = %s, created_at = %s, photo_data = %s
-                WHERE id = %s
-            """, (
+            _execute_prepared(cursor, 'save_meat_update', (
                 data['establishment_name'], data['owner_operator'], data['address'], data['inspector_name'],
                 data['establishment_no'], data['overall_score'], data.get('critical_score', 0), data['food_contact_surfaces'], data['water_samples'],
                 data['product_samples'], data['types_of_products'], data['staff_fhp'], data.get('staff_compliment', 0), data['water_public'],
@@ -545,19 +582,7 @@ def save_meat_processing_inspection(data):
             inspection_id = data['id']
             logging.info(f"📸 DB DEBUG - Updated inspection {inspection_id} with photo_data: {data.get('photo_data', '[]')[:100]}...")
         else:
-            cursor.execute("""
-                INSERT INTO meat_processing_inspections (
-                    establishment_name, owner_operator, address, inspector_name,
-                    establishment_no, overall_score, critical_score, food_contact_surfaces, water_samples,
-                    product_samples, types_of_products, staff_fhp, staff_compliment, water_public,
-                    water_private, type_processing, type_slaughter, purpose_of_visit,
-                    inspection_date, inspector_code, result, telephone_no,
-                    registration_status, action, comments, inspector_signature,
-                    received_by, created_at, photo_data
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id
-            """, (
+            _execute_prepared(cursor, 'save_meat_insert', (
                 data['establishment_name'], data['owner_operator'], data['address'], data['inspector_name'],
                 data['establishment_no'], data['overall_score'], data.get('critical_score', 0), data['food_contact_surfaces'], data['water_samples'],
                 data['product_samples'], data['types_of_products'], data['staff_fhp'], data.get('staff_compliment', 0), data['water_public'],
@@ -586,6 +611,7 @@ def save_meat_processing_inspection(data):
                 except ValueError:
                     continue
             conn.commit()
+        invalidate_details('meat', inspection_id)
 
         cursor.close()
         release_db_connection(conn)
@@ -607,6 +633,7 @@ def get_meat_processing_inspections():
     release_db_connection(conn)
     return inspections
 
+@cached_details('meat')
 def get_meat_processing_inspection_details(inspection_id):
     """Get meat processing inspection details"""
     import logging
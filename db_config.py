@@ -5,13 +5,47 @@ Switch between databases using the DATABASE_URL environment variable
 Includes connection pooling for PostgreSQL to handle concurrent users
 """
 import os
+import queue
+import atexit
 import sqlite3
+from pathlib import Path
 from urllib.parse import urlparse
 from contextlib import contextmanager
+from functools import lru_cache
 
 # Global connection pool (initialized on first use)
 _connection_pool = None
 
+# psycopg2 cursor class returning HybridRow objects (built on first use)
+_hybrid_cursor_class = None
+
+# Applied to every SQLite connection: WAL lets readers run alongside the
+# writer and, with synchronous=NORMAL, a commit costs one WAL fsync instead
+# of two rollback-journal fsyncs. page_size only takes effect on a new,
+# empty database, so it comes before the journal mode write.
+SQLITE_PRAGMAS = (
+    "PRAGMA page_size=8192;"
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-65536;"
+    "PRAGMA mmap_size=268435456;"
+    "PRAGMA busy_timeout=5000;"
+)
+
+# Read-only connections (mode=ro) cannot switch the journal mode; they pick
+# up WAL from the database file, so they skip that pragma
+SQLITE_READ_PRAGMAS = SQLITE_PRAGMAS.replace("PRAGMA journal_mode=WAL;", "")
+
+# Idle SQLite connections kept open for reuse, one pool per database path
+# and access mode (read-write or read-only)
+SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', '8'))
+_sqlite_pools = {}
+
+
+class _ReadOnlySqliteConnection(sqlite3.Connection):
+    """Marks SQLite connections opened with mode=ro so they return to the read-only pool."""
+
 
 class HybridRow:
     """Row class that supports both numeric indexing and dictionary access"""
@@ -47,6 +81,37 @@ class HybridRow:
         return iter(self._row)
 
 
+def _get_hybrid_cursor_class():
+    """
+    Return the psycopg2 cursor class that wraps rows in HybridRow.
+
+    Built once per process and reused for every pooled connection, instead of
+    defining a new class each time a connection is checked out.
+    """
+    global _hybrid_cursor_class
+
+    if _hybrid_cursor_class is not None:
+        return _hybrid_cursor_class
+
+    import psycopg2.extensions
+
+    class HybridCursor(psycopg2.extensions.cursor):
+        def fetchone(self):
+            row = super().fetchone()
+            return HybridRow(self, row) if row else None
+
+        def fetchmany(self, size=None):
+            rows = super().fetchmany(size) if size else super().fetchmany()
+            return [HybridRow(self, row) for row in rows]
+
+        def fetchall(self):
+            rows = super().fetchall()
+            return [HybridRow(self, row) for row in rows]
+
+    _hybrid_cursor_class = HybridCursor
+    return _hybrid_cursor_class
+
+
 def _init_connection_pool():
     """
     Initialize PostgreSQL connection pool (called once on first connection).
@@ -115,12 +180,17 @@ def _init_connection_pool():
     return None
 
 
-def get_db_connection():
+def get_db_connection(readonly=False):
     """
     Get database connection from pool (PostgreSQL) or direct connection (SQLite).
 
     For PostgreSQL: Returns a connection from the pool (fast, reusable)
-    For SQLite: Returns a new connection (suitable for development)
+    For SQLite: Returns a pooled connection, opening a new one if none is idle
+
+    Args:
+        readonly: SQLite only - hand out a mode=ro connection from a separate
+            pool. Readers never take write locks and run alongside the writer
+            under WAL. Ignored for PostgreSQL.
 
     Returns:
         Database connection object (SQLite or PostgreSQL)
@@ -150,19 +220,7 @@ def get_db_connection():
             if pool is None:
                 raise Exception("Connection pool not available")
 
-            # Custom cursor class that uses HybridRow
-            class HybridCursor(psycopg2.extensions.cursor):
-                def fetchone(self):
-                    row = super().fetchone()
-                    return HybridRow(self, row) if row else None
-
-                def fetchmany(self, size=None):
-                    rows = super().fetchmany(size) if size else super().fetchmany()
-                    return [HybridRow(self, row) for row in rows]
-
-                def fetchall(self):
-                    rows = super().fetchall()
-                    return [HybridRow(self, row) for row in rows]
+            HybridCursor = _get_hybrid_cursor_class()
 
             # Get connection from pool
             conn = pool.getconn()
@@ -199,14 +257,76 @@ def get_db_connection():
 
     # Use SQLite (default)
     db_path = os.getenv('SQLITE_DB_PATH', 'inspections.db')
-    conn = sqlite3.connect(db_path)
+    try:
+        return _get_sqlite_pool(db_path, readonly).get_nowait()
+    except queue.Empty:
+        pass
+    if readonly:
+        try:
+            return _connect_sqlite_readonly(db_path)
+        except sqlite3.OperationalError:
+            # Database file not created yet - a read-write connection will create it
+            pass
+    return _connect_sqlite(db_path)
+
+
+def _connect_sqlite(db_path):
+    """Open a SQLite connection with row access by name and SQLITE_PRAGMAS applied."""
+    # Pooled connections are handed to whichever thread asks next
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row  # Make rows accessible by column name
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
+
+
+def _connect_sqlite_readonly(db_path):
+    """Open a read-only (mode=ro) SQLite connection with SQLITE_READ_PRAGMAS applied."""
+    uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256,
+                           factory=_ReadOnlySqliteConnection)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SQLITE_READ_PRAGMAS)
     return conn
 
 
+def _get_sqlite_pool(db_path, readonly=False):
+    """Return the idle-connection queue for a SQLite database path and access mode."""
+    key = (db_path, readonly)
+    pool = _sqlite_pools.get(key)
+    if pool is None:
+        pool = _sqlite_pools.setdefault(key, queue.LifoQueue(maxsize=SQLITE_POOL_SIZE))
+    return pool
+
+
+def _close_sqlite_pools():
+    """Close every idle pooled SQLite connection (registered with atexit)."""
+    for pool in _sqlite_pools.values():
+        while True:
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                break
+            _close_sqlite(conn)
+
+
+def _close_sqlite(conn):
+    """Close a healthy SQLite connection, letting PRAGMA optimize refresh planner stats first."""
+    try:
+        conn.execute("PRAGMA optimize")
+    except Exception:
+        pass
+    try:
+        conn.close()
+    except:
+        pass
+
+
+atexit.register(_close_sqlite_pools)
+
+
 def release_db_connection(conn, error=False):
     """
-    Return a PostgreSQL connection to the pool, or close SQLite connection.
+    Return a connection to its pool (PostgreSQL or SQLite).
 
     If there was an error, the connection is closed instead of returned to pool
     to prevent bad connections from contaminating the pool.
@@ -260,7 +380,19 @@ def release_db_connection(conn, error=False):
                 except:
                     pass
     else:
-        # Close SQLite connection
+        # Return SQLite connection to its pool, discarding any uncommitted work.
+        # Errored, already-closed or surplus connections are closed instead.
+        if not error:
+            try:
+                conn.rollback()
+                readonly = isinstance(conn, _ReadOnlySqliteConnection)
+                _get_sqlite_pool(os.getenv('SQLITE_DB_PATH', 'inspections.db'), readonly).put_nowait(conn)
+                return
+            except queue.Full:
+                _close_sqlite(conn)
+                return
+            except Exception:
+                pass
         try:
             conn.close()
         except:
@@ -306,17 +438,30 @@ def dict_factory(cursor, row):
     return dict(zip(columns, row))
 
 
+@lru_cache(maxsize=4)
+def _db_type_for_url(database_url):
+    """Classify a DATABASE_URL value (memoized; the URL rarely changes in a process)"""
+    if database_url and (database_url.startswith('postgres://') or database_url.startswith('postgresql://')):
+        return 'postgresql'
+    return 'sqlite'
+
+
 def get_db_type():
     """
     Returns the current database type being used.
 
+    The result is memoized per DATABASE_URL value, so repeated calls on the
+    request path cost one environment lookup and a cache hit.
+
     Returns:
         str: 'postgresql' or 'sqlite'
     """
-    database_url = os.getenv('DATABASE_URL', '')
-    if database_url and (database_url.startswith('postgres://') or database_url.startswith('postgresql://')):
-        return 'postgresql'
-    return 'sqlite'
+    return _db_type_for_url(os.getenv('DATABASE_URL', ''))
+
+
+@lru_cache(maxsize=4)
+def _placeholder_for_type(db_type):
+    return '%s' if db_type == 'postgresql' else '?'
 
 
 def get_placeholder():
@@ -333,7 +478,7 @@ def get_placeholder():
         placeholder = get_placeholder()
         query = f"SELECT * FROM users WHERE id = {placeholder}"
     """
-    return '%s' if get_db_type() == 'postgresql' else '?'
+    return _placeholder_for_type(get_db_type())
 
 
 def execute_query(conn, query, params=None):
@@ -373,6 +518,46 @@ def execute_query(conn, query, params=None):
     return cursor
 
 
+def execute_many(conn, query, params_list, page_size=100):
+    """
+    Execute one statement for many parameter rows with automatic placeholder conversion.
+
+    PostgreSQL uses psycopg2.extras.execute_batch, which sends page_size
+    statements per server round trip instead of one. SQLite uses the
+    cursor's executemany (no network round trips to save).
+
+    Args:
+        conn: Database connection
+        query: SQL statement with ? or %s placeholders
+        params_list: Sequence of parameter tuples
+        page_size: Statements per round trip on PostgreSQL
+
+    Returns:
+        Cursor object used for the batch
+
+    Example:
+        execute_many(conn, "DELETE FROM form_items WHERE id = ?", [(1,), (2,)])
+    """
+    is_postgresql = hasattr(conn, 'cursor_factory')
+
+    if is_postgresql and '?' in query:
+        query = query.replace('?', '%s')
+    elif not is_postgresql and '%s' in query:
+        query = query.replace('%s', '?')
+
+    cursor = conn.cursor()
+    if not params_list:
+        return cursor
+
+    if is_postgresql:
+        from psycopg2.extras import execute_batch
+        execute_batch(cursor, query, params_list, page_size=page_size)
+    else:
+        cursor.executemany(query, params_list)
+
+    return cursor
+
+
 def init_database():
     """
     Initialize database schema.
@@ -0,0 +1,73 @@
+"""
+Short-lived cache for inspection detail lookups.
+
+Detail pages re-read the same inspection on every hit while it rarely
+changes. Results (photos included) are kept per (getter, id) for
+DETAILS_CACHE_TTL seconds and dropped early by invalidate_details() when that
+inspection is written. Entries are per process, so a write made by another
+worker shows up here within the TTL.
+"""
+import time
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# Entries hold whole detail dicts, photo data URLs included, so the bound is
+# kept small
+DETAILS_CACHE_SIZE = 256
+DETAILS_CACHE_TTL = 60
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+# (module, getter name) of the cached getters reading each kind of inspection
+_getters = {}
+
+
+def copy_details(details):
+    """Copy a detail dict and its nested score dicts (values below that are scalars)"""
+    return {key: value.copy() if isinstance(value, dict) else value for key, value in details.items()}
+
+
+def cached_details(kind):
+    """
+    Cache a detail getter's result per inspection id. Missing inspections are
+    not cached, so a row inserted later is found straight away. Callers get a
+    copy, so mutating the returned dict never touches the cached one.
+    """
+    def decorate(getter):
+        getter_key = (getter.__module__, getter.__name__)
+        _getters.setdefault(kind, []).append(getter_key)
+
+        @wraps(getter)
+        def wrapper(inspection_id):
+            key = getter_key + (inspection_id,)
+            with _lock:
+                entry = _cache.get(key)
+                if entry is not None:
+                    if time.monotonic() - entry[0] <= DETAILS_CACHE_TTL:
+                        _cache.move_to_end(key)
+                        return copy_details(entry[1])
+                    del _cache[key]
+
+            details = getter(inspection_id)
+            if details is not None:
+                with _lock:
+                    _cache[key] = (time.monotonic(), copy_details(details))
+                    if len(_cache) > DETAILS_CACHE_SIZE:
+                        _cache.popitem(last=False)
+            return details
+        return wrapper
+    return decorate
+
+
+def invalidate_details(kind, inspection_id):
+    """Drop cached details for one inspection after it is written"""
+    with _lock:
+        for getter_key in _getters.get(kind, ()):
+            _cache.pop(getter_key + (inspection_id,), None)
+
+
+def clear_details():
+    """Drop every cached detail (after bulk updates)"""
+    with _lock:
+        _cache.clear()
@@ -5,6 +5,7 @@ Run this ONCE to create the admin user directly in the database
 """
 import os
 from db_config import get_db_connection, release_db_connection, get_db_type
+from password_hashing import hash_password
 
 def create_admin_user():
     """Create admin user directly in PostgreSQL database"""
@@ -46,7 +47,7 @@ def create_admin_user():
                 role = EXCLUDED.role,
                 email = EXCLUDED.email,
                 parish = EXCLUDED.parish
-        """, ('admin', 'Admin901!secure', 'admin', 'admin@inspection.local', 'Westmoreland'))
+        """, ('admin', hash_password('Admin901!secure'), 'admin', 'admin@inspection.local', 'Westmoreland'))
 
         conn.commit()
 
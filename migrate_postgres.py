@@ -99,6 +99,33 @@ def migrate_postgres():
             conn.rollback()
             errors += 1
 
+        # Migration 3: Store user_sessions.last_activity as a native timestamp
+        print("\n📋 Migration 3: Convert user_sessions.last_activity to TIMESTAMP")
+        try:
+            c.execute("""
+                SELECT data_type
+                FROM information_schema.columns
+                WHERE table_name = 'user_sessions' AND column_name = 'last_activity'
+            """)
+            last_activity_col = c.fetchone()
+
+            if last_activity_col and last_activity_col[0] == 'text':
+                # Values are written as 'YYYY-MM-DD HH:MM:SS', which casts directly
+                c.execute("""
+                    ALTER TABLE user_sessions
+                    ALTER COLUMN last_activity TYPE TIMESTAMP
+                    USING NULLIF(last_activity, '')::timestamp
+                """)
+                conn.commit()
+                print("   ✅ last_activity is now TIMESTAMP")
+            else:
+                print("   ✅ last_activity is already a timestamp type")
+            migrations_run += 1
+        except Exception as e:
+            print(f"   ⚠️  Migration 3 warning: {e}")
+            conn.rollback()
+            errors += 1
+
         # Add more migrations here as needed
         # Migration 2: Example
         # print("\n📋 Migration 2: Description")
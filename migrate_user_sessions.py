@@ -64,6 +64,10 @@ def migrate_user_sessions():
             print("❌ MIGRATION FAILED - user_role column still missing")
             return False
 
+        # Index the active-users map filter (is_active = 1 AND last_activity > cutoff)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_active_activity ON user_sessions(is_active, last_activity)")
+        conn.commit()
+
         print("=" * 70)
         print("✅ Migration complete! You can now login without errors")
         print("=" * 70)
@@ -0,0 +1,42 @@
+"""
+Password hashing for the users table.
+
+Passwords are stored as "pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>",
+so the salt travels with the hash and no extra column is needed. Accounts
+created before hashing still hold the plain password; verify_password
+accepts both forms.
+"""
+import os
+import hmac
+import hashlib
+
+PASSWORD_HASH_PREFIX = 'pbkdf2_sha256'
+PASSWORD_HASH_ITERATIONS = 260000
+PASSWORD_SALT_BYTES = 16
+
+
+def hash_password(password, iterations=PASSWORD_HASH_ITERATIONS):
+    """Return a salted PBKDF2-SHA256 hash string for storage in users.password"""
+    salt = os.urandom(PASSWORD_SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f"{PASSWORD_HASH_PREFIX}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def is_password_hash(stored):
+    """True if a users.password value was produced by hash_password"""
+    return isinstance(stored, str) and stored.startswith(PASSWORD_HASH_PREFIX + '$')
+
+
+def verify_password(stored, password):
+    """Check a submitted password against a stored hash (or legacy plain value)"""
+    if not stored or password is None:
+        return False
+    if not is_password_hash(stored):
+        return hmac.compare_digest(str(stored).encode('utf-8'), password.encode('utf-8'))
+    try:
+        _, iterations, salt_hex, digest_hex = stored.split('$')
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'),
+                                     bytes.fromhex(salt_hex), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), digest_hex)
@@ -4,6 +4,7 @@ Reset admin password
 """
 from database import get_db_connection, release_db_connection
 from db_config import get_placeholder
+from password_hashing import hash_password
 
 def reset_admin_password(new_password="admin123"):
     """Reset admin password to a known value"""
@@ -24,7 +25,7 @@ def reset_admin_password(new_password="admin123"):
             cursor.execute(f"""
                 INSERT INTO users (username, email, password, role, parish, first_login)
                 VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, 0)
-            """, ('admin', 'admin@inspection.gov.jm', new_password, 'admin', 'Kingston', 0))
+            """, ('admin', 'admin@inspection.gov.jm', hash_password(new_password), 'admin', 'Kingston', 0))
             conn.commit()
             print(f"✓ Created admin user with password: {new_password}")
 
@@ -36,7 +37,7 @@ def reset_admin_password(new_password="admin123"):
             # Reset password for first admin
             first_admin_id = admins[0][0]
             cursor.execute(f"UPDATE users SET password = {ph}, first_login = 0 WHERE id = {ph}",
-                          (new_password, first_admin_id))
+                          (hash_password(new_password), first_admin_id))
             conn.commit()
             print(f"\n✓ Reset password for admin (ID: {first_admin_id})")
             print(f"  Username: {admins[0][1]}")
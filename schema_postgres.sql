@@ -295,6 +295,11 @@ CREATE INDEX IF NOT EXISTS idx_inspections_result ON inspections(result);
 CREATE INDEX IF NOT EXISTS idx_residential_result ON residential_inspections(result);
 CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
 CREATE INDEX IF NOT EXISTS idx_login_history_user ON login_history(user_id);
+CREATE INDEX IF NOT EXISTS idx_form_items_tpl_order ON form_items(form_template_id, item_order) INCLUDE (id, item_id, description, weight, is_critical, category);
+-- Inspector history: filtered by inspector, newest first, covering the listed columns (index-only scans)
+CREATE INDEX IF NOT EXISTS idx_insp_inspector_cover ON inspections(inspector_name, inspection_date DESC) INCLUDE (id, establishment_name, type_of_establishment, created_at, result, form_type);
+CREATE INDEX IF NOT EXISTS idx_res_inspector_cover ON residential_inspections(inspector_name, inspection_date DESC) INCLUDE (id, premises_name, created_at, result);
+CREATE INDEX IF NOT EXISTS idx_meat_inspector_cover ON meat_processing_inspections(inspector_name, inspection_date DESC) INCLUDE (id, establishment_name, created_at, result);
 
 -- Insert default users
 INSERT INTO users (username, password, role) VALUES
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the inspection detail cache
+"""
+import detail_cache
+
+ROWS = {}
+CALLS = []
+
+
+@detail_cache.cached_details('burial')
+def get_test_details(inspection_id):
+    CALLS.append(inspection_id)
+    row = ROWS.get(inspection_id)
+    return dict(row, scores=dict(row['scores'])) if row else None
+
+
+def _reset():
+    detail_cache.clear_details()
+    ROWS.clear()
+    CALLS.clear()
+
+
+def test_hits_until_invalidated():
+    print("=" * 70)
+    print("DETAIL CACHE TEST - hits and invalidation")
+    print("=" * 70)
+    _reset()
+    ROWS[1] = {'id': 1, 'photo_data': '[{"data": "data:image/png;base64,AAAA"}]', 'scores': {'1': 2}}
+
+    first = get_test_details(1)
+    first['scores']['1'] = 99
+    second = get_test_details(1)
+    assert CALLS == [1]
+    assert second['scores'] == {'1': 2} and second['photo_data'] == ROWS[1]['photo_data']
+    print("   ✓ Second read served from the cache, photos included, unaffected by caller edits")
+
+    ROWS[1] = dict(ROWS[1], photo_data='[]')
+    detail_cache.invalidate_details('burial', 1)
+    assert get_test_details(1)['photo_data'] == '[]'
+    assert CALLS == [1, 1]
+    print("   ✓ invalidate_details forces a fresh read")
+
+
+def test_ttl_and_missing_rows():
+    print("=" * 70)
+    print("DETAIL CACHE TEST - TTL and missing inspections")
+    print("=" * 70)
+    _reset()
+
+    assert get_test_details(2) is None
+    ROWS[2] = {'id': 2, 'scores': {}}
+    assert get_test_details(2) == {'id': 2, 'scores': {}}
+    print("   ✓ A missing inspection is not cached")
+
+    ttl = detail_cache.DETAILS_CACHE_TTL
+    detail_cache.DETAILS_CACHE_TTL = -1
+    try:
+        get_test_details(2)
+    finally:
+        detail_cache.DETAILS_CACHE_TTL = ttl
+    assert CALLS == [2, 2, 2]
+    print("   ✓ Expired entries are read again")
+
+
+if __name__ == "__main__":
+    test_hits_until_invalidated()
+    test_ttl_and_missing_rows()
+    print("\n✅ All detail cache tests passed")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the inspection detail getters on a fresh SQLite database
+"""
+import os
+import sqlite3
+import tempfile
+
+os.environ.pop('DATABASE_URL', None)
+
+import database
+
+
+def test_small_hotel_skips_items_without_item_id():
+    print("=" * 70)
+    print("INSPECTION DETAILS TEST - Small Hotel item without item_id")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'inspections.db')
+        os.environ['SQLITE_DB_PATH'] = db_path
+        try:
+            database.init_db()
+            conn = sqlite3.connect(db_path)
+            conn.execute("INSERT INTO inspections (id, establishment_name, form_type, photo_data) "
+                         "VALUES (1, 'Seaside Inn', 'Small Hotel', '[]')")
+            conn.executemany("INSERT INTO inspection_items (id, inspection_id, item_id, obser, error) VALUES (?, 1, ?, ?, ?)",
+                             [(1, '1a', '2', ''), (2, None, 'a', 'b')])
+            conn.commit()
+            conn.close()
+
+            details = database.get_small_hotels_inspection_details(1)
+            assert details['establishment_name'] == 'Seaside Inn'
+            assert details['obser'] == {'1a': '2'}
+            assert details['error'] == {'1a': '0'}
+            print("   ✓ Items with a NULL item_id are left out of the scores")
+        finally:
+            os.environ.pop('SQLITE_DB_PATH', None)
+
+
+if __name__ == "__main__":
+    test_small_hotel_skips_items_without_item_id()
+    print("\n✅ Inspection details test passed")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script to verify cached list reads on SQLite
+"""
+import os
+import sqlite3
+import tempfile
+
+os.environ.pop('DATABASE_URL', None)
+
+import database
+
+
+def test_list_cache_sees_outside_writes():
+    print("=" * 70)
+    print("LIST CACHE TEST - writes from another connection")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'inspections.db')
+        os.environ['SQLITE_DB_PATH'] = db_path
+        try:
+            database.init_db()
+            database._cached_query.cache_clear()
+
+            assert database.get_inspections() == []
+            assert database.get_inspections() == []
+            assert database._cached_query.cache_info().hits == 1
+            print("   ✓ Unchanged database served from the cache")
+
+            # Plain sqlite3 writes, as another worker or app.py's raw SQL would make
+            conn = sqlite3.connect(db_path)
+            conn.execute("INSERT INTO inspections (id, establishment_name) VALUES (1, 'Harbour Grill')")
+            conn.commit()
+            assert [row['establishment_name'] for row in database.get_inspections()] == ['Harbour Grill']
+            print("   ✓ Insert from another connection shows up at once")
+
+            conn.execute("UPDATE inspections SET establishment_name = 'Harbour Grill & Bar' WHERE id = 1")
+            conn.commit()
+            assert [row['establishment_name'] for row in database.get_inspections()] == ['Harbour Grill & Bar']
+            conn.execute("DELETE FROM inspections")
+            conn.commit()
+            conn.close()
+            assert database.get_inspections() == []
+            print("   ✓ Updates and deletes invalidate the cached list too")
+        finally:
+            os.environ.pop('SQLITE_DB_PATH', None)
+
+
+if __name__ == "__main__":
+    test_list_cache_sees_outside_writes()
+    print("\n✅ List cache test passed")
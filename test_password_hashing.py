@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script to verify password hashing and verification for the users table
+"""
+from password_hashing import hash_password, is_password_hash, verify_password
+
+
+def test_hash_round_trip():
+    print("=" * 70)
+    print("PASSWORD HASHING TEST - round trip")
+    print("=" * 70)
+
+    stored = hash_password('Insp123!secure')
+    assert is_password_hash(stored)
+    assert 'Insp123!secure' not in stored
+    assert verify_password(stored, 'Insp123!secure')
+    # Each hash gets its own salt
+    assert hash_password('Insp123!secure') != stored
+    print("   ✓ Hashed password verifies")
+
+
+def test_wrong_password():
+    print("=" * 70)
+    print("PASSWORD HASHING TEST - wrong password")
+    print("=" * 70)
+
+    stored = hash_password('Insp123!secure')
+    assert not verify_password(stored, 'Insp124!secure')
+    assert not verify_password(stored, '')
+    assert not verify_password(stored, None)
+    print("   ✓ Wrong passwords are rejected")
+
+
+def test_legacy_plaintext():
+    print("=" * 70)
+    print("PASSWORD HASHING TEST - legacy plain-text accounts")
+    print("=" * 70)
+
+    assert not is_password_hash('Admin901!secure')
+    assert verify_password('Admin901!secure', 'Admin901!secure')
+    assert not verify_password('Admin901!secure', 'admin901!secure')
+    assert not verify_password(None, 'Admin901!secure')
+    assert not verify_password('', '')
+    print("   ✓ Plain-text passwords still verify exactly")
+
+
+def test_malformed_hash():
+    print("=" * 70)
+    print("PASSWORD HASHING TEST - malformed stored hashes")
+    print("=" * 70)
+
+    stored = hash_password('Insp123!secure')
+    prefix, iterations, salt_hex, digest_hex = stored.split('$')
+    malformed = [
+        f"{prefix}${iterations}${salt_hex}",                   # missing digest
+        f"{prefix}$many${salt_hex}${digest_hex}",              # non-numeric iterations
+        f"{prefix}${iterations}$not-hex${digest_hex}",         # bad salt
+        f"{prefix}${iterations}${salt_hex}${digest_hex}$x",    # extra field
+        f"{prefix}${iterations}${salt_hex}${digest_hex[:-2]}",  # truncated digest
+    ]
+    for value in malformed:
+        assert not verify_password(value, 'Insp123!secure'), value
+    print("   ✓ Malformed hashes fail verification without raising")
+
+
+if __name__ == "__main__":
+    test_hash_round_trip()
+    test_wrong_password()
+    test_legacy_plaintext()
+    test_malformed_hash()
+    print("\n✅ All password hashing tests passed")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script to verify init_db and update_database_schema on SQLite databases
+"""
+import io
+import os
+import sqlite3
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+
+os.environ.pop('DATABASE_URL', None)
+
+import database
+
+
+def test_init_db_stamps_then_skips():
+    print("=" * 70)
+    print("SCHEMA VERSION TEST - fresh SQLite database")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'inspections.db')
+        os.environ['SQLITE_DB_PATH'] = db_path
+        try:
+            database.init_db()
+            conn = sqlite3.connect(db_path)
+            assert conn.execute("SELECT version FROM schema_meta").fetchall() == [(database.SCHEMA_VERSION,)]
+            assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 7
+            assert conn.execute("SELECT COUNT(*) FROM form_templates").fetchone()[0] == 9
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert {'idx_insp_inspector_date', 'idx_res_inspector_date', 'idx_meat_inspector_date'} <= indexes
+            assert not {name for name in indexes if name.endswith('_inspector_cover')}
+            conn.close()
+            print(f"   ✓ First run completed and stamped version {database.SCHEMA_VERSION}")
+
+            output = io.StringIO()
+            with redirect_stdout(output):
+                database.init_db()
+            assert f"already at version {database.SCHEMA_VERSION}" in output.getvalue()
+            assert "initialized successfully" not in output.getvalue()
+            print("   ✓ Second run skipped the DDL and seed pass")
+        finally:
+            os.environ.pop('SQLITE_DB_PATH', None)
+
+
+def test_init_db_adds_photo_data_to_older_tables():
+    print("=" * 70)
+    print("SCHEMA VERSION TEST - inspections table from before photos")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'inspections.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE inspections (id INTEGER PRIMARY KEY, establishment_name TEXT, inspector_name TEXT, "
+                     "inspection_date TEXT, type_of_establishment TEXT, created_at TEXT, result TEXT, form_type TEXT)")
+        conn.execute("INSERT INTO inspections (id, establishment_name) VALUES (1, 'Old Cafe')")
+        conn.commit()
+        conn.close()
+        os.environ['SQLITE_DB_PATH'] = db_path
+        try:
+            database.init_db()
+            conn = sqlite3.connect(db_path)
+            assert conn.execute("SELECT photo_data FROM inspections WHERE id = 1").fetchone() == ('[]',)
+            conn.close()
+            print("   ✓ photo_data added with its '[]' default")
+        finally:
+            os.environ.pop('SQLITE_DB_PATH', None)
+
+
+def test_init_db_failure_rolls_everything_back():
+    print("=" * 70)
+    print("SCHEMA VERSION TEST - failure part way through")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'inspections.db')
+        conn = sqlite3.connect(db_path)
+        # A table holding an index name makes the lookup index batch fail after the core tables
+        conn.execute("CREATE TABLE idx_messages_receiver_read (id INTEGER)")
+        conn.commit()
+        conn.close()
+        os.environ['SQLITE_DB_PATH'] = db_path
+        try:
+            with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                try:
+                    database.init_db()
+                    raise AssertionError("init_db should have failed")
+                except sqlite3.OperationalError:
+                    pass
+            conn = sqlite3.connect(db_path)
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            conn.close()
+            assert tables == {'idx_messages_receiver_read'}, tables
+            print("   ✓ No table from the failed run was left behind")
+        finally:
+            os.environ.pop('SQLITE_DB_PATH', None)
+
+
+def test_update_database_schema_runs():
+    print("=" * 70)
+    print("SCHEMA VERSION TEST - update_database_schema")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'inspections.db')
+        os.environ['SQLITE_DB_PATH'] = db_path
+        try:
+            database.init_db()
+            output = io.StringIO()
+            with redirect_stdout(output):
+                database.update_database_schema()
+            assert "Error" not in output.getvalue(), output.getvalue()
+
+            conn = sqlite3.connect(db_path)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(inspections)")}
+            assert {'status', 'parish', 'score_1A', 'score_9C', 'photo_data'} <= columns
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert {'idx_inspections_date', 'idx_inspections_result', 'idx_residential_result'} <= indexes
+            conn.close()
+            print("   ✓ Columns and indexes added")
+
+            # Nothing is missing any more, so a second run only re-checks the indexes
+            output = io.StringIO()
+            with redirect_stdout(output):
+                database.update_database_schema()
+            assert output.getvalue() == "", output.getvalue()
+            print("   ✓ Second run adds nothing")
+        finally:
+            os.environ.pop('SQLITE_DB_PATH', None)
+
+
+if __name__ == "__main__":
+    test_init_db_stamps_then_skips()
+    test_init_db_adds_photo_data_to_older_tables()
+    test_init_db_failure_rolls_everything_back()
+    test_update_database_schema_runs()
+    print("\n✅ Schema tests passed")
@@ -10,6 +10,7 @@ a = Analysis(
         ('templates', 'templates'),
         ('static', 'static'),
         ('integrity_manifest.json', '.'),
+        ('food_establishment_v1.json', '.'),
         ('schema_postgres.sql', '.'),
         ('gunicorn_config.py', '.'),
     ],